@@ -0,0 +1,28 @@
+"""FastAPI dependencies providing the application services."""
+
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import Request
+from app.services import ModelService, DVCService, ClearMLService
+
+
+# Dependencies are async so FastAPI resolves them on the event loop
+# instead of dispatching each one to the threadpool
+
+async def get_model_service(request: Request) -> ModelService:
+    """Get the model service created at startup."""
+    return request.app.state.model_service
+
+
+async def get_dvc_service(request: Request) -> DVCService:
+    """Get the DVC service created at startup."""
+    return request.app.state.dvc_service
+
+
+async def get_clearml_service(request: Request) -> ClearMLService:
+    """Get the ClearML service created at startup."""
+    return request.app.state.clearml_service
+
+
+async def get_training_executor(request: Request) -> ProcessPoolExecutor:
+    """Get the process pool for training created at startup."""
+    return request.app.state.training_executor
@@ -0,0 +1,24 @@
+"""Custom API response classes."""
+
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, with native numpy array support."""
+    
+    def render(self, content: Any) -> bytes:
+        """
+        Serialize content to JSON bytes.
+        
+        Args:
+            content: Response content, may contain numpy arrays and scalars
+            
+        Returns:
+            Encoded JSON
+        """
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
@@ -1,33 +1,100 @@
 """REST API routes."""
 
-from fastapi import APIRouter, HTTPException, UploadFile, File
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Response
+from typing import Any, Dict, List, Set
+from concurrent.futures import ProcessPoolExecutor
+import aiofiles
+import asyncio
+import logging
 import os
 import json
+import numpy as np
+from cachetools import TTLCache
 from app.api.schemas import (
     HealthResponse,
     ModelClassResponse,
     TrainRequest,
     TrainResponse,
+    TrainJobResponse,
+    TrainStatusResponse,
     PredictRequest,
+    PredictRequestRaw,
     PredictResponse,
     RetrainRequest,
     ModelsListResponse,
     DatasetsListResponse,
     UploadDatasetResponse
 )
+from app.api.dependencies import (
+    get_model_service,
+    get_dvc_service,
+    get_clearml_service,
+    get_training_executor
+)
 from app.services import ModelService, DVCService, ClearMLService
+from app.services.model_service import TrainingInProgressError, run_training
+from app.api.responses import ORJSONResponse
 from app.config import settings
 from app.utils.logger import setup_logger
+from app.utils.datasets import SUPPORTED_EXTENSIONS
 
 logger = setup_logger(__name__)
 
 router = APIRouter()
 
-# Initialize services
-model_service = ModelService()
-dvc_service = DVCService()
-clearml_service = ClearMLService()
+# Dataset uploads are streamed to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Running training tasks of this worker process; the event loop only keeps weak
+# references to tasks. Job state is recorded in the model index, so any API
+# worker can report it.
+TRAINING_JOBS: Set["asyncio.Task[None]"] = set()
+
+# Short-lived cache for the model listing, cleared whenever models change
+# (DVCService caches the dataset listing itself)
+_models_cache = TTLCache(maxsize=1, ttl=2.0)
+_models_lock = asyncio.Lock()
+
+
+async def _get_cached(cache: TTLCache, lock: asyncio.Lock, func):
+    """
+    Return the cached result of func, recomputing it in a worker thread when expired.
+    
+    The lock makes concurrent requests on an expired cache wait for a single
+    recomputation instead of each running func.
+    
+    Args:
+        cache: Cache holding the result
+        lock: Lock guarding recomputation
+        func: Blocking function producing the result
+        
+    Returns:
+        Result of func
+    """
+    value = cache.get('value')
+    if value is not None:
+        return value
+    
+    async with lock:
+        value = cache.get('value')
+        if value is None:
+            value = await asyncio.to_thread(func)
+            cache['value'] = value
+    return value
+
+
+async def _require_file(path: str, detail: str) -> None:
+    """
+    Raise a 404 unless path exists, without blocking the event loop.
+    
+    Args:
+        path: Path to check
+        detail: Error detail for the 404 response
+    """
+    try:
+        await asyncio.to_thread(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=detail)
 
 
 @router.get("/health", response_model=HealthResponse)
@@ -43,7 +110,7 @@ async def health_check():
 
 
 @router.get("/models/available", response_model=ModelClassResponse)
-async def get_available_models():
+async def get_available_models(model_service: ModelService = Depends(get_model_service)):
     """
     Get list of available model classes for training.
     
@@ -56,7 +123,7 @@ async def get_available_models():
 
 
 @router.get("/models", response_model=ModelsListResponse)
-async def list_models():
+async def list_models(model_service: ModelService = Depends(get_model_service)):
     """
     Get list of all trained models.
     
@@ -64,54 +131,135 @@ async def list_models():
         List of model information
     """
     logger.info("Requested list of models")
-    models = model_service.list_models()
+    models = await _get_cached(_models_cache, _models_lock, model_service.list_models)
     return ModelsListResponse(models=models)
 
 
-@router.post("/models/train", response_model=TrainResponse)
-async def train_model(request: TrainRequest):
+async def _run_training_job(
+    model_service: ModelService,
+    clearml_service: ClearMLService,
+    executor: ProcessPoolExecutor,
+    model_class: str,
+    model_id: str,
+    hyperparameters: Dict[str, Any],
+    dataset_path: str,
+    warm_start: bool = False
+) -> None:
+    """
+    Train a model in a worker process and record the result in the model index.
+    
+    The model's training job must already be marked in flight (by
+    create_model or start_training); it stays so until the trained model is
+    loaded, so the model cannot be deleted or retrained in the meantime.
+    
+    Args:
+        model_service: Model service holding the created model
+        clearml_service: ClearML service to upload the trained model to
+        executor: Process pool to train in
+        model_class: Name of the model class
+        model_id: ID of the model
+        hyperparameters: Model hyperparameters
+        dataset_path: Path to the training dataset
+        warm_start: Grow the saved model instead of training a new one
+    """
+    try:
+        loop = asyncio.get_running_loop()
+        metrics, model_path = await loop.run_in_executor(
+            executor,
+            run_training,
+            model_class,
+            model_id,
+            hyperparameters,
+            dataset_path,
+            settings.models_dir,
+            warm_start
+        )
+        
+        # Pick up the model saved by the worker
+        await asyncio.to_thread(model_service.finish_training, model_id, model_class, metrics)
+    except Exception as e:
+        logger.error(f"Training of model {model_id} failed: {e}")
+        await asyncio.to_thread(model_service.fail_training, model_id, str(e))
+        return
+    finally:
+        _models_cache.clear()
+    
+    # The job is already reported as completed while the upload runs
+    logger.info(f"Training of model {model_id} completed")
+    await asyncio.to_thread(
+        clearml_service.upload_model,
+        model_id,
+        model_path,
+        model_class,
+        hyperparameters,
+        metrics
+    )
+
+
+def _start_training_job(*args: Any) -> None:
+    """
+    Run _run_training_job in the background, keeping a reference to its task.
+    
+    Args:
+        *args: Arguments of _run_training_job
+    """
+    job = asyncio.create_task(_run_training_job(*args))
+    TRAINING_JOBS.add(job)
+    job.add_done_callback(TRAINING_JOBS.discard)
+
+
+@router.post("/models/train", response_model=TrainJobResponse, status_code=202)
+async def train_model(
+    request: TrainRequest,
+    model_service: ModelService = Depends(get_model_service),
+    dvc_service: DVCService = Depends(get_dvc_service),
+    clearml_service: ClearMLService = Depends(get_clearml_service),
+    executor: ProcessPoolExecutor = Depends(get_training_executor)
+):
     """
-    Train a new model with specified hyperparameters.
+    Start training a new model with specified hyperparameters.
+    
+    Training runs in a worker process; poll /models/{model_id}/status and
+    fetch the metrics from /models/{model_id}/result once it completes.
     
     Args:
         request: Training request with model class, hyperparameters, and dataset
         
     Returns:
-        Training results with model ID and metrics
+        ID of the model being trained
     """
     logger.info(f"Training request: model_class={request.model_class}, dataset={request.dataset_name}")
     
     try:
         # Get dataset path
         dataset_path = dvc_service.get_dataset_path(request.dataset_name)
-        if not os.path.exists(dataset_path):
-            raise HTTPException(status_code=404, detail=f"Dataset {request.dataset_name} not found")
+        await _require_file(dataset_path, f"Dataset {request.dataset_name} not found")
         
         # Create model
-        model_id = model_service.create_model(
+        model_id = await asyncio.to_thread(
+            model_service.create_model,
             request.model_class,
             request.hyperparameters
         )
+        _models_cache.clear()
         
-        # Train model
-        metrics = model_service.train_model(model_id, dataset_path)
-        
-        # Upload to ClearML
-        model_path = os.path.join(settings.models_dir, f"{model_id}.pkl")
-        if os.path.exists(model_path):
-            clearml_service.upload_model(
-                model_id,
-                model_path,
-                request.model_class,
-                request.hyperparameters,
-                metrics
-            )
+        _start_training_job(
+            model_service,
+            clearml_service,
+            executor,
+            request.model_class,
+            model_id,
+            request.hyperparameters,
+            dataset_path
+        )
         
-        return TrainResponse(
+        return TrainJobResponse(
             model_id=model_id,
-            metrics=metrics,
-            message="Model trained successfully"
+            status='running',
+            message="Model training started"
         )
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.error(f"Training error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -120,8 +268,66 @@ async def train_model(request: TrainRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/models/{model_id}/status", response_model=TrainStatusResponse)
+async def get_training_status(
+    model_id: str,
+    model_service: ModelService = Depends(get_model_service)
+):
+    """
+    Get the status of a model's last training job.
+    
+    Args:
+        model_id: ID of the model
+        
+    Returns:
+        Training status and the error of a failed job
+    """
+    try:
+        info = await asyncio.to_thread(model_service.get_model_info, model_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return TrainStatusResponse(model_id=model_id, status=info['status'], error=info['error'])
+
+
+@router.get("/models/{model_id}/result", response_model=TrainResponse)
+async def get_training_result(
+    model_id: str,
+    model_service: ModelService = Depends(get_model_service)
+):
+    """
+    Get the metrics of a model's last completed training job.
+    
+    Args:
+        model_id: ID of the model
+        
+    Returns:
+        Training results with model ID and metrics
+    """
+    try:
+        info = await asyncio.to_thread(model_service.get_model_info, model_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    if info['status'] == 'running':
+        raise HTTPException(status_code=409, detail=f"Model {model_id} is still training")
+    if info['status'] == 'failed':
+        raise HTTPException(status_code=409, detail=f"Training of model {model_id} failed: {info['error']}")
+    if info['metrics'] is None:
+        raise HTTPException(status_code=404, detail=f"No training result recorded for model {model_id}")
+    
+    return TrainResponse(
+        model_id=model_id,
+        metrics=info['metrics'],
+        message="Model trained successfully"
+    )
+
+
 @router.post("/models/{model_id}/predict", response_model=PredictResponse)
-async def predict(model_id: str, request: PredictRequest):
+async def predict(
+    model_id: str,
+    request: PredictRequest,
+    model_service: ModelService = Depends(get_model_service)
+):
     """
     Get predictions from a trained model.
     
@@ -132,11 +338,60 @@ async def predict(model_id: str, request: PredictRequest):
     Returns:
         Predictions from the model
     """
-    logger.info(f"Prediction request for model {model_id}")
+    # Hot path: skip building the message when INFO is disabled
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Prediction request for model %s", model_id)
+    
+    try:
+        predictions = await asyncio.to_thread(model_service.predict_array, model_id, request.features)
+        # orjson serializes numeric arrays directly; other labels need Python objects
+        if predictions.dtype.kind in 'OSU':
+            predictions = predictions.tolist()
+        return ORJSONResponse(content={"predictions": predictions})
+    except ValueError as e:
+        logger.error(f"Prediction error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error during prediction: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/models/{model_id}/predict/raw")
+async def predict_raw(
+    model_id: str,
+    request: PredictRequestRaw,
+    model_service: ModelService = Depends(get_model_service)
+):
+    """
+    Get predictions for features sent as a raw buffer.
+    
+    Skips per-element JSON parsing and validation on the way in and list
+    conversion on the way out, which matters for large batches.
+    
+    Args:
+        model_id: ID of the model to use
+        request: Prediction request with shape, dtype and base64-encoded data
+        
+    Returns:
+        Predictions as little-endian float32 bytes; models with string
+        class labels are rejected
+    """
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Raw prediction request for model %s", model_id)
     
     try:
-        predictions = model_service.predict(model_id, request.features)
-        return PredictResponse(predictions=predictions)
+        dtype = np.dtype(request.dtype).newbyteorder('<')
+        X = np.frombuffer(request.data, dtype=dtype).reshape(request.shape)
+        predictions = await asyncio.to_thread(model_service.predict_array, model_id, X)
+        if predictions.dtype.kind not in 'biuf':
+            raise ValueError(
+                f"Model {model_id} predicts non-numeric labels, which cannot be "
+                f"returned as float32; use /models/{model_id}/predict instead"
+            )
+        return Response(
+            content=predictions.astype('<f4').tobytes(),
+            media_type="application/octet-stream"
+        )
     except ValueError as e:
         logger.error(f"Prediction error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -145,63 +400,81 @@ async def predict(model_id: str, request: PredictRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/models/{model_id}/retrain", response_model=TrainResponse)
-async def retrain_model(model_id: str, request: RetrainRequest):
+@router.post("/models/{model_id}/retrain", response_model=TrainJobResponse, status_code=202)
+async def retrain_model(
+    model_id: str,
+    request: RetrainRequest,
+    model_service: ModelService = Depends(get_model_service),
+    dvc_service: DVCService = Depends(get_dvc_service),
+    clearml_service: ClearMLService = Depends(get_clearml_service),
+    executor: ProcessPoolExecutor = Depends(get_training_executor)
+):
     """
-    Retrain an existing model.
+    Start retraining an existing model.
+    
+    Like training, this runs in a worker process; poll
+    /models/{model_id}/status and fetch the metrics from
+    /models/{model_id}/result once it completes.
     
     Args:
         model_id: ID of the model to retrain
         request: Retraining request with dataset and optional new hyperparameters
         
     Returns:
-        Training results
+        ID of the model being retrained
     """
     logger.info(f"Retraining request for model {model_id}")
     
     try:
-        model = model_service.get_model(model_id)
-        if not model:
-            raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
+        try:
+            info = await asyncio.to_thread(model_service.get_model_info, model_id)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
         
         # Get dataset path
         dataset_path = dvc_service.get_dataset_path(request.dataset_name)
-        if not os.path.exists(dataset_path):
-            raise HTTPException(status_code=404, detail=f"Dataset {request.dataset_name} not found")
+        await _require_file(dataset_path, f"Dataset {request.dataset_name} not found")
         
         # Update hyperparameters if provided
+        hyperparameters = dict(info['hyperparameters'])
         if request.hyperparameters:
-            model.hyperparameters.update(request.hyperparameters)
+            hyperparameters.update(request.hyperparameters)
         
-        # Train model
-        metrics = model_service.train_model(model_id, dataset_path)
+        # The model cannot be deleted or retrained again until the job ends
+        await asyncio.to_thread(model_service.start_training, model_id)
+        _models_cache.clear()
         
-        # Upload to ClearML
-        model_path = os.path.join(settings.models_dir, f"{model_id}.pkl")
-        if os.path.exists(model_path):
-            clearml_service.upload_model(
-                model_id,
-                model_path,
-                type(model).__name__,
-                model.get_hyperparameters(),
-                metrics
-            )
+        _start_training_job(
+            model_service,
+            clearml_service,
+            executor,
+            info['model_class'],
+            model_id,
+            hyperparameters,
+            dataset_path,
+            request.warm_start
+        )
         
-        return TrainResponse(
+        return TrainJobResponse(
             model_id=model_id,
-            metrics=metrics,
-            message="Model retrained successfully"
+            status='running',
+            message="Model retraining started"
         )
+    except HTTPException:
+        raise
+    except TrainingInProgressError as e:
+        logger.error(f"Retraining error: {e}")
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         logger.error(f"Retraining error: {e}")
-        raise HTTPException(status_code=400, detail=str(e))
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"Unexpected error during retraining: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.delete("/models/{model_id}")
-async def delete_model(model_id: str):
+async def delete_model(model_id: str, model_service: ModelService = Depends(get_model_service)):
     """
     Delete a trained model.
     
@@ -214,8 +487,12 @@ async def delete_model(model_id: str):
     logger.info(f"Delete request for model {model_id}")
     
     try:
-        model_service.delete_model(model_id)
+        await asyncio.to_thread(model_service.delete_model, model_id)
+        _models_cache.clear()
         return {"message": f"Model {model_id} deleted successfully"}
+    except TrainingInProgressError as e:
+        logger.error(f"Delete error: {e}")
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         logger.error(f"Delete error: {e}")
         raise HTTPException(status_code=404, detail=str(e))
@@ -225,7 +502,7 @@ async def delete_model(model_id: str):
 
 
 @router.get("/datasets", response_model=DatasetsListResponse)
-async def list_datasets():
+async def list_datasets(dvc_service: DVCService = Depends(get_dvc_service)):
     """
     Get list of available datasets.
     
@@ -233,14 +510,17 @@ async def list_datasets():
         List of dataset information
     """
     logger.info("Requested list of datasets")
-    datasets = dvc_service.list_datasets()
+    datasets = await asyncio.to_thread(dvc_service.list_datasets)
     return DatasetsListResponse(datasets=datasets)
 
 
 @router.post("/datasets/upload", response_model=UploadDatasetResponse)
-async def upload_dataset(file: UploadFile = File(...)):
+async def upload_dataset(
+    file: UploadFile = File(...),
+    dvc_service: DVCService = Depends(get_dvc_service)
+):
     """
-    Upload a new dataset (CSV or JSON format).
+    Upload a new dataset (CSV, JSON, JSON Lines, Parquet or HDF5 format).
     
     Args:
         file: Dataset file to upload
@@ -252,17 +532,17 @@ async def upload_dataset(file: UploadFile = File(...)):
     
     try:
         # Validate file extension
-        if not file.filename.endswith(('.csv', '.json')):
+        if not file.filename.endswith(SUPPORTED_EXTENSIONS):
             raise HTTPException(
                 status_code=400,
-                detail="Only CSV and JSON files are supported"
+                detail=f"Only {', '.join(SUPPORTED_EXTENSIONS)} files are supported"
             )
         
         # Save file
         file_path = os.path.join(settings.datasets_dir, file.filename)
-        with open(file_path, 'wb') as f:
-            content = await file.read()
-            f.write(content)
+        async with aiofiles.open(file_path, 'wb') as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await f.write(chunk)
         
         # Add to DVC
         dvc_service.add_dataset(file_path, file.filename)
@@ -272,6 +552,8 @@ async def upload_dataset(file: UploadFile = File(...)):
             message="Dataset uploaded successfully",
             dataset_name=file.filename
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error uploading dataset: {e}")
         raise HTTPException(status_code=500, detail=str(e))
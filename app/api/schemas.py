@@ -1,7 +1,39 @@
 """Pydantic schemas for API requests and responses."""
 
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+from typing import Annotated, List, Dict, Any, Optional, Literal, Tuple
+import numpy as np
+from pydantic import BaseModel, Base64Bytes, ConfigDict, Field, PlainValidator, WithJsonSchema, conint
+
+
+def _to_feature_matrix(value: Any) -> np.ndarray:
+    """Convert nested lists to a 2D float32 array in one C-level pass."""
+    try:
+        if isinstance(value, list) and len(value) == 1 and isinstance(value[0], list):
+            # Single row: fill a (1, n) buffer without nested-list dtype discovery
+            row = value[0]
+            matrix = np.fromiter(row, dtype=np.float32, count=len(row)).reshape(1, -1)
+        else:
+            matrix = np.asarray(value, dtype=np.float32)
+    except (TypeError, ValueError) as e:
+        # Pydantic reports ValueError as a 422; TypeError (e.g. objects in a row) would be a 500
+        raise ValueError(f"features must be numbers: {e}")
+    if matrix.ndim != 2:
+        raise ValueError("features must be a list of feature vectors")
+    # null elements convert to NaN, which the models cannot predict on
+    if np.isnan(matrix).any():
+        raise ValueError("features must not contain null or NaN values")
+    return matrix
+
+
+# Validated by numpy instead of per-element Pydantic checks
+FeatureMatrix = Annotated[
+    np.ndarray,
+    PlainValidator(_to_feature_matrix),
+    WithJsonSchema({
+        "type": "array",
+        "items": {"type": "array", "items": {"type": "number"}}
+    })
+]
 
 
 class HealthResponse(BaseModel):
@@ -29,9 +61,32 @@ class TrainResponse(BaseModel):
     message: str
 
 
+class TrainJobResponse(BaseModel):
+    """Response after starting a training job."""
+    model_id: str
+    status: Literal['running', 'completed', 'failed']
+    message: str
+
+
+class TrainStatusResponse(BaseModel):
+    """Status of a model's training job."""
+    model_id: str
+    status: Literal['running', 'completed', 'failed']
+    error: Optional[str] = None
+
+
 class PredictRequest(BaseModel):
     """Request for prediction."""
-    features: List[List[float]] = Field(..., description="List of feature vectors")
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    
+    features: FeatureMatrix = Field(..., description="List of feature vectors")
+
+
+class PredictRequestRaw(BaseModel):
+    """Request for prediction with features as a raw buffer."""
+    dtype: Literal['float32', 'float64'] = Field('float32', description="Little-endian element type")
+    shape: Tuple[conint(gt=0), conint(gt=0)] = Field(..., description="Number of rows and features")
+    data: Base64Bytes = Field(..., description="Base64-encoded feature matrix in row-major order")
 
 
 class PredictResponse(BaseModel):
@@ -43,6 +98,10 @@ class RetrainRequest(BaseModel):
     """Request for retraining a model."""
     dataset_name: str = Field(..., description="Name of the dataset to use")
     hyperparameters: Optional[Dict[str, Any]] = Field(None, description="New hyperparameters (optional)")
+    warm_start: bool = Field(
+        False,
+        description="Add trees up to hyperparameters.n_estimators instead of refitting (random_forest only)"
+    )
 
 
 class ModelInfo(BaseModel):
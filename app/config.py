@@ -12,6 +12,9 @@ class Settings(BaseSettings):
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     grpc_port: int = 50051
+    workers: int = int(os.getenv("API_WORKERS", "1"))
+    training_workers: int = int(os.getenv("TRAINING_WORKERS", "1"))
+    reload: bool = os.getenv("API_RELOAD", "false").lower() == "true"
     
     # ClearML Settings
     clearml_api_access_key: Optional[str] = os.getenv("CLEARML_API_ACCESS_KEY")
@@ -29,10 +32,27 @@ class Settings(BaseSettings):
     # Model Storage
     models_dir: str = os.getenv("MODELS_DIR", "models")
     datasets_dir: str = os.getenv("DATASETS_DIR", "app/data")
+    max_loaded_model_bytes: int = int(os.getenv("MAX_LOADED_MODEL_BYTES", str(2 << 30)))
+    max_loaded_models: int = int(os.getenv("MAX_LOADED_MODELS", "32"))
+    model_compress: int = int(os.getenv("MODEL_COMPRESS", "0"))
+    dataset_cache_size: int = int(os.getenv("DATASET_CACHE_SIZE", "2"))
+    dataset_chunk_rows: int = int(os.getenv("DATASET_CHUNK_ROWS", "200000"))
+    dataset_parquet_cache: bool = os.getenv("DATASET_PARQUET_CACHE", "false").lower() == "true"
+    dvc_use_cli: bool = os.getenv("DVC_USE_CLI", "false").lower() == "true"
     
     # Logging
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
     
+    @property
+    def threads_per_worker(self) -> int:
+        """CPU cores available to each API worker process."""
+        return max(1, (os.cpu_count() or 1) // max(1, self.workers))
+    
+    @property
+    def training_threads(self) -> int:
+        """CPU cores for each training process of an API worker's training pool."""
+        return max(1, self.threads_per_worker // max(1, self.training_workers))
+    
     class Config:
         """Pydantic config."""
         env_file = ".env"
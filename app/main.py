@@ -1,19 +1,62 @@
 """Main FastAPI application."""
 
+import multiprocessing
+import os
+from app.config import settings
+
+# Split the cores between uvicorn workers; must happen before numpy/sklearn load BLAS/OpenMP
+for _var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+    os.environ.setdefault(_var, str(settings.threads_per_worker))
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import router
-from app.config import settings
+from app.api.responses import ORJSONResponse
+from app.services import ModelService, DVCService, ClearMLService
 from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create services on startup and release resources on shutdown."""
+    logger.info("Starting MLOps API service")
+    logger.info(f"API will be available at http://{settings.api_host}:{settings.api_port}")
+    logger.info(f"Worker process {os.getpid()} using {settings.threads_per_worker} threads")
+    for directory in (settings.models_dir, settings.datasets_dir):
+        os.makedirs(directory, exist_ok=True)
+    app.state.model_service = ModelService()
+    app.state.dvc_service = DVCService()
+    app.state.clearml_service = ClearMLService()
+    
+    # Training runs in worker processes so that sklearn fit does not block the event loop.
+    # Workers are started from a clean server process rather than forked from this one,
+    # which would copy its threads, locks and open files into every worker.
+    # Each of them fits with settings.training_threads cores, so together they
+    # use this worker's cores without oversubscribing them.
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    app.state.training_executor = ProcessPoolExecutor(
+        max_workers=max(1, settings.training_workers),
+        mp_context=multiprocessing.get_context(start_method)
+    )
+    
+    yield
+    
+    logger.info("Shutting down MLOps API service")
+    app.state.training_executor.shutdown(wait=False)
+
+
 app = FastAPI(
     title="MLOps Homework 1 API",
     description="API for training, managing, and using ML models",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -49,24 +92,14 @@ async def root():
         }
     }
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on startup."""
-    logger.info("Starting MLOps API service")
-    logger.info(f"API will be available at http://{settings.api_host}:{settings.api_port}")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown."""
-    logger.info("Shutting down MLOps API service")
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
         "app.main:app",
         host=settings.api_host,
         port=settings.api_port,
-        reload=True
+        workers=settings.workers,
+        reload=settings.reload
     )
 
 
@@ -4,6 +4,9 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, List
 import pickle
 import os
+import joblib
+import numpy as np
+from app.config import settings
 from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -53,6 +56,22 @@ class BaseModel(ABC):
         """
         pass
     
+    def predict_array(self, X) -> np.ndarray:
+        """
+        Make predictions without converting them to Python objects.
+        
+        Args:
+            X: Features for prediction
+            
+        Returns:
+            Array of predictions
+        """
+        if not self.is_trained:
+            raise ValueError(f"Model {self.model_id} is not trained yet")
+        
+        # Labels indexed from a memory-mapped classes_ array come back as np.memmap
+        return np.asarray(self.model.predict(X))
+    
     @abstractmethod
     def get_hyperparameters(self) -> Dict[str, Any]:
         """
@@ -71,28 +90,45 @@ class BaseModel(ABC):
             path: Path to save the model
         """
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, 'wb') as f:
-            pickle.dump({
-                'model': self.model,
-                'hyperparameters': self.hyperparameters,
-                'model_id': self.model_id,
-                'is_trained': self.is_trained
-            }, f)
+        # Uncompressed files (the default) can be memory-mapped on load;
+        # MODEL_COMPRESS trades that for smaller lz4-compressed files
+        compress = ('lz4', settings.model_compress) if settings.model_compress else 0
+        
+        # joblib writes numpy buffers directly instead of pickling them element by element
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        joblib.dump({
+            'model': self.model,
+            'hyperparameters': self.hyperparameters,
+            'model_id': self.model_id,
+            'is_trained': self.is_trained
+        }, tmp_path, compress=compress, protocol=pickle.HIGHEST_PROTOCOL)
+        # Replace rather than overwrite: workers that mapped the old file keep reading it
+        os.replace(tmp_path, path)
         logger.info(f"Model {self.model_id} saved to {path}")
     
     def load(self, path: str) -> None:
         """
         Load the model from disk.
         
+        Arrays of uncompressed files are memory-mapped read-only instead of
+        read into memory. Estimators that keep them as numpy arrays (linear
+        model coefficients, classes_) page them in on demand and share them
+        between processes; sklearn trees copy their node arrays into their
+        own buffers while unpickling, so forests are still fully resident in
+        every process. Mapped arrays must not be modified in place; training
+        assigns new arrays instead.
+        
         Args:
             path: Path to load the model from
         """
         with open(path, 'rb') as f:
-            data = pickle.load(f)
-            self.model = data['model']
-            self.hyperparameters = data['hyperparameters']
-            self.model_id = data['model_id']
-            self.is_trained = data['is_trained']
+            # Uncompressed joblib files start with the pickle protocol opcode
+            compressed = f.read(1) != pickle.PROTO
+        data = joblib.load(path, mmap_mode=None if compressed else 'r')
+        # Re-run the constructor so subclass attributes match the saved hyperparameters
+        self.__init__(data['model_id'], data['hyperparameters'])
+        self.model = data['model']
+        self.is_trained = data['is_trained']
         logger.info(f"Model {self.model_id} loaded from {path}")
 
 
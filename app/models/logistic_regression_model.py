@@ -82,12 +82,7 @@ class LogisticRegressionModel(BaseModel):
         Returns:
             List of predictions
         """
-        if not self.is_trained:
-            raise ValueError(f"Model {self.model_id} is not trained yet")
-        
-        predictions = self.model.predict(X)
-        logger.info(f"Made {len(predictions)} predictions with model {self.model_id}")
-        return predictions.tolist()
+        return self.predict_array(X).tolist()
     
     def get_hyperparameters(self) -> Dict[str, Any]:
         """Get model hyperparameters."""
@@ -0,0 +1,178 @@
+"""Compact, quantized representation of a fitted random forest."""
+
+import numpy as np
+
+
+class QuantizedForest:
+    """
+    Inference-only random forest with int8 thresholds and float16 leaf values.
+
+    Split thresholds are quantized per feature to int8 over the range of that
+    feature's thresholds and dequantized to float32 when predicting, so
+    predictions approximate those of the original forest. All trees are
+    stored in flat arrays; child indices point into these arrays and leaves
+    have a left child of -1.
+    """
+
+    def __init__(self, forest):
+        """
+        Build the compact representation from a fitted sklearn forest.
+
+        Args:
+            forest: Fitted RandomForestClassifier or RandomForestRegressor
+        """
+        if forest.n_outputs_ != 1:
+            raise ValueError("Quantization supports single-output forests only")
+
+        self.classes_ = getattr(forest, 'classes_', None)
+        self.n_features_in_ = forest.n_features_in_
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+
+        # Flatten trees, shifting child indices by each tree's offset
+        sizes = np.array([tree.node_count for tree in trees], dtype=np.int64)
+        self.roots = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        children_left = []
+        children_right = []
+        for root, tree in zip(self.roots, trees):
+            is_leaf = tree.children_left == -1
+            children_left.append(np.where(is_leaf, -1, tree.children_left + root))
+            children_right.append(np.where(is_leaf, -1, tree.children_right + root))
+        self.children_left = np.concatenate(children_left).astype(np.int32)
+        self.children_right = np.concatenate(children_right).astype(np.int32)
+        self.feature = np.concatenate([tree.feature for tree in trees]).astype(np.int32)
+        threshold = np.concatenate([tree.threshold for tree in trees])
+
+        # Leaf values: class probabilities for classifiers, the mean for regressors
+        value = np.concatenate([tree.value[:, 0, :] for tree in trees])
+        if self.classes_ is not None:
+            totals = value.sum(axis=1, keepdims=True)
+            value = np.divide(value, totals, out=np.zeros_like(value), where=totals > 0)
+        self.value = value.astype(np.float16)
+
+        # Per-feature affine quantization of split thresholds to [-127, 127]
+        internal = self.children_left != -1
+        split_feature = self.feature[internal]
+        split_threshold = threshold[internal]
+        low = np.full(self.n_features_in_, np.inf)
+        high = np.full(self.n_features_in_, -np.inf)
+        np.minimum.at(low, split_feature, split_threshold)
+        np.maximum.at(high, split_feature, split_threshold)
+        unused = np.isinf(low)
+        low[unused] = 0.0
+        high[unused] = 0.0
+        scale = (high - low) / 254.0
+        scale[scale == 0] = 1.0
+        self.zero_point = low.astype(np.float32)
+        self.scale = scale.astype(np.float32)
+
+        quantized = np.zeros(len(threshold), dtype=np.int8)
+        quantized[internal] = np.clip(
+            np.rint((split_threshold - low[split_feature]) / scale[split_feature]) - 127,
+            -127,
+            127
+        )
+        self.threshold = quantized
+        self._dequantized = None
+        self._leaf_values = None
+
+    def __getstate__(self):
+        """Drop the dequantized caches when pickling."""
+        state = self.__dict__.copy()
+        state['_dequantized'] = None
+        state['_leaf_values'] = None
+        return state
+
+    @property
+    def n_trees(self) -> int:
+        """Number of trees in the forest."""
+        return len(self.roots)
+
+    def dequantized_thresholds(self) -> np.ndarray:
+        """
+        Get float32 split thresholds, computing them on first use.
+
+        Returns:
+            Threshold per node (meaningless for leaves)
+        """
+        if self._dequantized is None:
+            feature = np.where(self.children_left != -1, self.feature, 0)
+            thresholds = self.threshold.astype(np.float32)
+            thresholds += 127
+            np.multiply(thresholds, self.scale[feature], out=thresholds)
+            thresholds += self.zero_point[feature]
+            self._dequantized = thresholds
+        return self._dequantized
+
+    def leaf_values(self) -> np.ndarray:
+        """
+        Get float32 leaf values, computing them on first use.
+
+        Numba has no float16 support, so the compiled path reads these.
+
+        Returns:
+            Array of shape (n_nodes, n_values)
+        """
+        if self._leaf_values is None:
+            self._leaf_values = self.value.astype(np.float32)
+        return self._leaf_values
+
+    def predict_values(self, X) -> np.ndarray:
+        """
+        Average leaf values over all trees.
+
+        Args:
+            X: Features for prediction
+
+        Returns:
+            Array of shape (n_samples, n_values)
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+
+        # Imported here so that numba only loads once a quantized model predicts
+        from app.models import rf_numba
+        if rf_numba.NUMBA_AVAILABLE:
+            return rf_numba.predict_batch(
+                X,
+                self.roots,
+                self.children_left,
+                self.children_right,
+                self.feature,
+                self.threshold,
+                self.scale,
+                self.zero_point,
+                self.leaf_values()
+            )
+
+        thresholds = self.dequantized_thresholds()
+        total = np.zeros((X.shape[0], self.value.shape[1]), dtype=np.float32)
+
+        for root in self.roots:
+            node = np.full(X.shape[0], root, dtype=np.int64)
+            active = np.arange(X.shape[0])
+            while active.size:
+                current = node[active]
+                left = self.children_left[current]
+                internal = left != -1
+                active = active[internal]
+                current = current[internal]
+                go_left = X[active, self.feature[current]] <= thresholds[current]
+                node[active] = np.where(go_left, left[internal], self.children_right[current])
+            total += self.value[node]
+
+        total /= self.n_trees
+        return total
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Make predictions.
+
+        Args:
+            X: Features for prediction
+
+        Returns:
+            Predicted class labels or regression values
+        """
+        values = self.predict_values(X)
+        if self.classes_ is not None:
+            return self.classes_[np.argmax(values, axis=1)]
+        return values[:, 0]
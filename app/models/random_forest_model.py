@@ -3,8 +3,10 @@
 from typing import Dict, Any, List
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
-from sklearn.metrics import accuracy_score, mean_squared_error, r2_score
+from sklearn.metrics import mean_squared_error
+from app.config import settings
 from app.models.base_model import BaseModel
+from app.models.quantized_forest import QuantizedForest
 from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -24,18 +26,31 @@ class RandomForestModel(BaseModel):
                 - max_depth: Maximum depth (default: None)
                 - min_samples_split: Minimum samples to split (default: 2)
                 - task_type: 'classification' or 'regression' (default: 'classification')
+                - quantize: Store int8 thresholds / float16 leaf values after training,
+                  trading some accuracy for a ~4x smaller model (default: False)
+                - n_jobs: Number of cores for fitting and prediction
+                  (default: the cores of one training process, see
+                  settings.training_threads)
+                - compute_mse: Also report training MSE for regression, which needs
+                  an extra pass over the training set (default: False)
         """
         super().__init__(model_id, hyperparameters)
         self.task_type = hyperparameters.get('task_type', 'classification')
         self.n_estimators = hyperparameters.get('n_estimators', 100)
         self.max_depth = hyperparameters.get('max_depth', None)
         self.min_samples_split = hyperparameters.get('min_samples_split', 2)
+        self.quantize = hyperparameters.get('quantize', False)
+        self.n_jobs = hyperparameters.get('n_jobs', settings.training_threads)
+        self.compute_mse = hyperparameters.get('compute_mse', False)
         
         if self.task_type == 'classification':
             self.model = RandomForestClassifier(
                 n_estimators=self.n_estimators,
                 max_depth=self.max_depth,
                 min_samples_split=self.min_samples_split,
+                n_jobs=self.n_jobs,
+                bootstrap=True,
+                oob_score=True,
                 random_state=42
             )
         else:
@@ -43,6 +58,9 @@ class RandomForestModel(BaseModel):
                 n_estimators=self.n_estimators,
                 max_depth=self.max_depth,
                 min_samples_split=self.min_samples_split,
+                n_jobs=self.n_jobs,
+                bootstrap=True,
+                oob_score=True,
                 random_state=42
             )
         
@@ -52,6 +70,10 @@ class RandomForestModel(BaseModel):
         """
         Train the Random Forest model.
         
+        Metrics are out-of-bag scores computed during fitting (accuracy for
+        classification, R^2 for regression), so no second pass over the
+        training set is needed.
+        
         Args:
             X: Training features
             y: Training labels
@@ -64,18 +86,51 @@ class RandomForestModel(BaseModel):
         self.is_trained = True
         
         # Calculate metrics
-        y_pred = self.model.predict(X)
         if self.task_type == 'classification':
-            accuracy = accuracy_score(y, y_pred)
-            metrics = {'accuracy': float(accuracy)}
+            metrics = {'accuracy': float(self.model.oob_score_)}
         else:
-            mse = mean_squared_error(y, y_pred)
-            r2 = r2_score(y, y_pred)
-            metrics = {'mse': float(mse), 'r2_score': float(r2)}
+            metrics = {'r2_score': float(self.model.oob_score_)}
+            if self.compute_mse:
+                mse = mean_squared_error(y, self.model.predict(X))
+                metrics['mse'] = float(mse)
+        
+        if self.quantize:
+            self.model = QuantizedForest(self.model)
+            logger.info(f"Quantized model {self.model_id}")
         
         logger.info(f"Model {self.model_id} trained. Metrics: {metrics}")
         return metrics
     
+    def grow(self, X, y, n_estimators: int) -> Dict[str, Any]:
+        """
+        Add trees to the fitted forest instead of refitting it from scratch.
+        
+        Only the new trees are fitted; the other hyperparameters of the
+        existing forest are kept.
+        
+        Args:
+            X: Training features
+            y: Training labels
+            n_estimators: New total number of trees
+            
+        Returns:
+            Dictionary with training metrics
+        """
+        if not self.is_trained or isinstance(self.model, QuantizedForest):
+            raise ValueError(f"Model {self.model_id} has no fitted forest to grow")
+        if n_estimators <= self.n_estimators:
+            raise ValueError(
+                f"n_estimators must be greater than {self.n_estimators} to grow model {self.model_id}"
+            )
+        
+        logger.info(f"Growing RandomForest model {self.model_id} to {n_estimators} trees")
+        self.n_estimators = n_estimators
+        self.hyperparameters['n_estimators'] = n_estimators
+        self.model.set_params(warm_start=True, n_estimators=n_estimators)
+        metrics = self.train(X, y)
+        self.model.set_params(warm_start=False)
+        return metrics
+    
     def predict(self, X) -> List[Any]:
         """
         Make predictions.
@@ -86,12 +141,7 @@ class RandomForestModel(BaseModel):
         Returns:
             List of predictions
         """
-        if not self.is_trained:
-            raise ValueError(f"Model {self.model_id} is not trained yet")
-        
-        predictions = self.model.predict(X)
-        logger.info(f"Made {len(predictions)} predictions with model {self.model_id}")
-        return predictions.tolist()
+        return self.predict_array(X).tolist()
     
     def get_hyperparameters(self) -> Dict[str, Any]:
         """Get model hyperparameters."""
@@ -99,7 +149,10 @@ class RandomForestModel(BaseModel):
             'task_type': self.task_type,
             'n_estimators': self.n_estimators,
             'max_depth': self.max_depth,
-            'min_samples_split': self.min_samples_split
+            'min_samples_split': self.min_samples_split,
+            'quantize': self.quantize,
+            'n_jobs': self.n_jobs,
+            'compute_mse': self.compute_mse
         }
 
 
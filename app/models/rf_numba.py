@@ -0,0 +1,75 @@
+"""Numba-compiled inference for quantized random forests."""
+
+import threading
+import numpy as np
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Try to use Numba for compiled tree traversal, fall back to numpy
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.warning("numba not available, using numpy tree traversal. Install with: pip install numba")
+
+
+def _predict_batch(X, roots, children_left, children_right, feature,
+                   threshold, scale, zero_point, value):
+    """
+    Average leaf values of all trees for each sample.
+
+    Samples are split across cores; each one walks every tree, dequantizing
+    int8 thresholds on the fly.
+
+    Args:
+        X: Contiguous float32 features of shape (n_samples, n_features)
+        roots: Index of each tree's root node
+        children_left: Left child per node, -1 for leaves
+        children_right: Right child per node, -1 for leaves
+        feature: Split feature per node
+        threshold: int8 quantized split threshold per node
+        scale: float32 quantization scale per feature
+        zero_point: float32 quantization zero point per feature
+        value: float32 leaf values of shape (n_nodes, n_values)
+
+    Returns:
+        Array of shape (n_samples, n_values)
+    """
+    n_samples = X.shape[0]
+    n_values = value.shape[1]
+    total = np.zeros((n_samples, n_values), dtype=np.float32)
+
+    for i in prange(n_samples):
+        for t in range(roots.shape[0]):
+            node = roots[t]
+            while children_left[node] != -1:
+                f = feature[node]
+                bound = (np.float32(threshold[node]) + np.float32(127.0)) * scale[f] + zero_point[f]
+                if X[i, f] <= bound:
+                    node = children_left[node]
+                else:
+                    node = children_right[node]
+            for k in range(n_values):
+                total[i, k] += value[node, k]
+        for k in range(n_values):
+            total[i, k] /= roots.shape[0]
+
+    return total
+
+
+if NUMBA_AVAILABLE:
+    # No fastmath: its no-NaN/no-inf assumptions would change comparisons on such features
+    _predict_batch_jit = njit(parallel=True, cache=True, nogil=True)(_predict_batch)
+
+    # Numba's default workqueue threading layer must not be entered from several
+    # threads at once; a call already uses every core, so calls take turns
+    _kernel_lock = threading.Lock()
+
+    def predict_batch(*args):
+        """Run the compiled predict kernel, one call at a time."""
+        with _kernel_lock:
+            return _predict_batch_jit(*args)
+else:
+    predict_batch = None
@@ -3,12 +3,13 @@
 from app.services.model_service import ModelService
 from app.services.dvc_service import DVCService
 from app.services.clearml_service import ClearMLService
-from app.services.s3_service import S3Service
+from app.services.s3_service import S3Service, get_s3_service
 
 __all__ = [
     'ModelService',
     'DVCService',
     'ClearMLService',
-    'S3Service'
+    'S3Service',
+    'get_s3_service'
 ]
 
@@ -34,7 +34,7 @@ class ClearMLService:
                 self.initialized = True
                 logger.info("ClearML service initialized")
             except Exception as e:
-                logger.error(f"Failed to initialize ClearML: {e}")
+                logger.error("Failed to initialize ClearML: %s", e)
         else:
             logger.warning("ClearML not configured or not available")
     
@@ -84,10 +84,10 @@ class ClearMLService:
             task.set_parameter("model_class", model_class)
             
             task_id = task.id
-            logger.info(f"Created ClearML experiment {task_id} for model {model_id}")
+            logger.info("Created ClearML experiment %s for model %s", task_id, model_id)
             return task_id
         except Exception as e:
-            logger.error(f"Error creating ClearML experiment: {e}")
+            logger.error("Error creating ClearML experiment: %s", e)
             return None
     
     def upload_model(
@@ -136,10 +136,10 @@ class ClearMLService:
             model.set_metadata("metrics", metrics)
             
             model_id_clearml = model.id
-            logger.info(f"Uploaded model {model_id} to ClearML as {model_id_clearml}")
+            logger.info("Uploaded model %s to ClearML as %s", model_id, model_id_clearml)
             return model_id_clearml
         except Exception as e:
-            logger.error(f"Error uploading model to ClearML: {e}")
+            logger.error("Error uploading model to ClearML: %s", e)
             return None
     
     def download_model(self, clearml_model_id: str, local_path: str) -> str:
@@ -164,10 +164,10 @@ class ClearMLService:
             import shutil
             shutil.copy2(model_path, local_path)
             
-            logger.info(f"Downloaded model {clearml_model_id} to {local_path}")
+            logger.info("Downloaded model %s to %s", clearml_model_id, local_path)
             return local_path
         except Exception as e:
-            logger.error(f"Error downloading model from ClearML: {e}")
+            logger.error("Error downloading model from ClearML: %s", e)
             raise
 
 
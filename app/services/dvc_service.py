@@ -1,70 +1,157 @@
 """Service for working with DVC."""
 
 import os
+import shutil
 import subprocess
-import json
+import threading
 from typing import List, Dict, Any
+from cachetools import TTLCache
 from app.config import settings
+from app.utils.datasets import SUPPORTED_EXTENSIONS
 from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Seconds a dataset listing is reused while the datasets directory is unchanged
+LIST_CACHE_TTL = 5.0
+
+# Try to use DVC's Python API in-process, fall back to the dvc CLI
+try:
+    from dvc.repo import Repo
+    DVC_AVAILABLE = True
+except ImportError:
+    DVC_AVAILABLE = False
+    logger.warning("dvc Python API not available, using dvc CLI. Install with: pip install dvc")
+
 
 class DVCService:
     """Service for managing datasets with DVC."""
     
-    def __init__(self):
-        """Initialize the DVC service."""
+    def __init__(self, use_cli: bool = settings.dvc_use_cli):
+        """
+        Initialize the DVC service.
+        
+        Args:
+            use_cli: Run the dvc CLI in a subprocess instead of using the Python API
+        """
         self.datasets_dir = settings.datasets_dir
-        os.makedirs(self.datasets_dir, exist_ok=True)
-        logger.info(f"DVCService initialized with datasets_dir: {self.datasets_dir}")
+        
+        # Repo is not thread-safe, and listing runs in worker threads
+        self._lock = threading.Lock()
+        self._repo = None
+        self._index_mtime = None
+        if DVC_AVAILABLE and not use_cli:
+            try:
+                self._repo = Repo(os.path.dirname(os.path.abspath(self.datasets_dir)))
+            except Exception as e:
+                logger.warning("Could not open DVC repository, using dvc CLI: %s", e)
+        
+        # Listing cache keyed by the datasets directory mtime; the lock lets one
+        # thread rebuild an expired listing while the others wait for it
+        self._list_cache = TTLCache(maxsize=1, ttl=LIST_CACHE_TTL)
+        self._list_lock = threading.Lock()
+        
+        logger.info("DVCService initialized with datasets_dir: %s", self.datasets_dir)
     
     def list_datasets(self) -> List[Dict[str, Any]]:
         """
         List all datasets tracked by DVC.
         
+        The listing is cached for a few seconds and rebuilt early when the
+        datasets directory changes or a dataset is added or removed.
+        
+        Returns:
+            List of dataset information dictionaries
+        """
+        key = os.stat(self.datasets_dir).st_mtime_ns
+        with self._list_lock:
+            datasets = self._list_cache.get(key)
+            if datasets is None:
+                datasets = self._list_datasets()
+                self._list_cache.clear()
+                self._list_cache[key] = datasets
+        return datasets
+    
+    def clear_cache(self) -> None:
+        """Drop the cached dataset listing."""
+        with self._list_lock:
+            self._list_cache.clear()
+    
+    def _list_datasets(self) -> List[Dict[str, Any]]:
+        """
+        Build the dataset listing from DVC, or from the directory if that fails.
+        
         Returns:
             List of dataset information dictionaries
         """
         try:
-            # Run dvc list to get tracked files
-            result = subprocess.run(
-                ['dvc', 'list', '.', '--dvc-only'],
-                capture_output=True,
-                text=True,
-                cwd=self.datasets_dir
-            )
+            files = self._list_tracked()
             
             datasets = []
-            if result.returncode == 0:
-                files = result.stdout.strip().split('\n')
-                for file in files:
-                    if file:
-                        file_path = os.path.join(self.datasets_dir, file)
-                        if os.path.exists(file_path):
-                            size = os.path.getsize(file_path)
-                            datasets.append({
-                                'name': file,
-                                'path': file_path,
-                                'size': size
-                            })
-            
-            logger.info(f"Listed {len(datasets)} datasets")
-            return datasets
-        except Exception as e:
-            logger.error(f"Error listing datasets: {e}")
-            # Fallback: list files in datasets directory
-            datasets = []
-            for file in os.listdir(self.datasets_dir):
-                if file.endswith(('.csv', '.json')):
+            for file in files:
+                if file:
                     file_path = os.path.join(self.datasets_dir, file)
+                    try:
+                        size = os.stat(file_path).st_size
+                    except FileNotFoundError:
+                        continue
                     datasets.append({
                         'name': file,
                         'path': file_path,
-                        'size': os.path.getsize(file_path)
+                        'size': size
                     })
+            
+            logger.info("Listed %d datasets", len(datasets))
+            return datasets
+        except Exception as e:
+            logger.error("Error listing datasets: %s", e)
+            # Fallback: list files in datasets directory
+            datasets = []
+            with os.scandir(self.datasets_dir) as entries:
+                for entry in entries:
+                    # is_file skips the Parquet cache directory and other subdirectories
+                    if entry.is_file() and entry.name.endswith(SUPPORTED_EXTENSIONS):
+                        datasets.append({
+                            'name': entry.name,
+                            'path': entry.path,
+                            'size': entry.stat().st_size
+                        })
             return datasets
     
+    def _list_tracked(self) -> List[str]:
+        """
+        List names of DVC-tracked files in the datasets directory.
+        
+        Returns:
+            File names relative to the datasets directory
+        """
+        if self._repo is not None:
+            # Repo.ls is a staticmethod that opens a new Repo per call; the
+            # filesystem of the opened repo reuses its config, SCM and index
+            path = os.path.relpath(os.path.abspath(self.datasets_dir), self._repo.root_dir)
+            with self._lock:
+                # The index is cached too: drop it once datasets were added or
+                # removed, possibly by another worker
+                mtime = os.stat(self.datasets_dir).st_mtime_ns
+                if mtime != self._index_mtime:
+                    self._repo._reset()
+                    self._index_mtime = mtime
+                entries = self._repo.dvcfs.ls(path.replace(os.sep, '/'), detail=True)
+            return [
+                os.path.basename(entry['name']) for entry in entries
+                if entry.get('dvc_info', {}).get('isout')
+            ]
+        
+        result = subprocess.run(
+            ['dvc', 'list', '.', '--dvc-only'],
+            capture_output=True,
+            text=True,
+            cwd=self.datasets_dir
+        )
+        if result.returncode != 0:
+            return []
+        return result.stdout.strip().split('\n')
+    
     def add_dataset(self, file_path: str, dataset_name: str) -> str:
         """
         Add a dataset to DVC tracking.
@@ -79,26 +166,37 @@ class DVCService:
         try:
             target_path = os.path.join(self.datasets_dir, dataset_name)
             
-            # Copy file to datasets directory
-            import shutil
-            shutil.copy2(file_path, target_path)
+            # Copy file to datasets directory unless it was written there directly
+            if os.path.abspath(file_path) != os.path.abspath(target_path):
+                shutil.copy2(file_path, target_path)
             
             # Add to DVC
+            if self._repo is not None:
+                try:
+                    with self._lock:
+                        self._repo.add(os.path.abspath(target_path))
+                    logger.info("Added dataset %s to DVC", dataset_name)
+                except Exception as e:
+                    logger.warning("DVC add failed: %s", e)
+                self.clear_cache()
+                return target_path
+            
             result = subprocess.run(
                 ['dvc', 'add', target_path],
                 capture_output=True,
                 text=True,
                 cwd=os.path.dirname(self.datasets_dir)
             )
+            self.clear_cache()
             
             if result.returncode == 0:
-                logger.info(f"Added dataset {dataset_name} to DVC")
+                logger.info("Added dataset %s to DVC", dataset_name)
                 return target_path
             else:
-                logger.warning(f"DVC add failed: {result.stderr}")
+                logger.warning("DVC add failed: %s", result.stderr)
                 return target_path
         except Exception as e:
-            logger.error(f"Error adding dataset: {e}")
+            logger.error("Error adding dataset: %s", e)
             raise
     
     def remove_dataset(self, dataset_name: str) -> None:
@@ -112,19 +210,27 @@ class DVCService:
             dataset_path = os.path.join(self.datasets_dir, dataset_name)
             
             # Remove from DVC
-            subprocess.run(
-                ['dvc', 'remove', dataset_path],
-                capture_output=True,
-                text=True
-            )
+            if self._repo is not None:
+                try:
+                    with self._lock:
+                        self._repo.remove(os.path.abspath(dataset_path) + '.dvc')
+                except Exception as e:
+                    logger.warning("DVC remove failed: %s", e)
+            else:
+                subprocess.run(
+                    ['dvc', 'remove', dataset_path],
+                    capture_output=True,
+                    text=True
+                )
             
             # Remove file
             if os.path.exists(dataset_path):
                 os.remove(dataset_path)
+            self.clear_cache()
             
-            logger.info(f"Removed dataset {dataset_name}")
+            logger.info("Removed dataset %s", dataset_name)
         except Exception as e:
-            logger.error(f"Error removing dataset: {e}")
+            logger.error("Error removing dataset: %s", e)
             raise
     
     def get_dataset_path(self, dataset_name: str) -> str:
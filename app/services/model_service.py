@@ -1,26 +1,120 @@
 """Service for managing ML models."""
 
+import io
+import json
+import logging
 import os
+import pickle
+import threading
 import uuid
-from typing import Dict, Any, List, Optional
-import pandas as pd
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Any, IO, List, Optional, Tuple
 import numpy as np
 from app.models import MODEL_REGISTRY, BaseModel
 from app.config import settings
+from app.utils.datasets import load_dataset
 from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Advisory file locks keep index updates from concurrent API workers apart
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Sidecar file in models_dir recording the class, status and last training
+# job (status, metrics, error) of every model
+INDEX_FILE = "index.json"
+
+
+class TrainingInProgressError(RuntimeError):
+    """Raised when a model cannot be changed because a training job on it is in flight."""
+
+
+def run_training(
+    model_class: str,
+    model_id: str,
+    hyperparameters: Dict[str, Any],
+    dataset_path: str,
+    models_dir: str,
+    warm_start: bool = False
+) -> Tuple[Dict[str, Any], str]:
+    """
+    Train a model and save it to disk.
+    
+    Meant to run in a worker process: it only takes picklable arguments and
+    builds the model from the registry instead of using ModelService state.
+    
+    Args:
+        model_class: Name of the model class
+        model_id: ID of the model
+        hyperparameters: Model hyperparameters; 'feature_columns' optionally
+            selects the dataset columns to train on
+        dataset_path: Path to the training dataset
+        models_dir: Directory to save the model to
+        warm_start: Grow the saved model to hyperparameters['n_estimators']
+            trees instead of training a new one (random_forest only)
+        
+    Returns:
+        Training metrics and path to the saved model
+    """
+    if model_class not in MODEL_REGISTRY:
+        raise ValueError(f"Unknown model class: {model_class}")
+    
+    model_cls = MODEL_REGISTRY[model_class]
+    model_path = os.path.join(models_dir, f"{model_id}.pkl")
+    X, y = load_dataset(dataset_path, hyperparameters.get('feature_columns'))
+    
+    if warm_start:
+        if not hasattr(model_cls, 'grow'):
+            raise ValueError(f"Model class {model_class} does not support warm start")
+        if not os.path.exists(model_path):
+            raise ValueError(f"Model {model_id} has not been trained yet")
+        model = model_cls(model_id, {})
+        model.load(model_path)
+        metrics = model.grow(X, y, hyperparameters.get('n_estimators', model.n_estimators))
+    else:
+        model = model_cls(model_id, hyperparameters)
+        metrics = model.train(X, y)
+    
+    model.save(model_path)
+    
+    logger.info("Model %s trained successfully. Metrics: %s", model_id, metrics)
+    return metrics, model_path
+
 
 class ModelService:
     """Service for managing ML models."""
     
     def __init__(self):
         """Initialize the model service."""
-        self.models: Dict[str, BaseModel] = {}
+        # Loaded models in least- to most-recently used order, bounded by count and estimated size
+        self.models: "OrderedDict[str, BaseModel]" = OrderedDict()
+        self._model_sizes: Dict[str, int] = {}
+        self._loaded_bytes = 0
+        self._max_loaded_bytes = settings.max_loaded_model_bytes
+        self._max_loaded_models = settings.max_loaded_models
         self.models_dir = settings.models_dir
-        os.makedirs(self.models_dir, exist_ok=True)
-        logger.info(f"ModelService initialized with models_dir: {self.models_dir}")
+        
+        # _dict_lock guards the shared containers and is only held briefly;
+        # per-model locks serialize loading and deleting one model while
+        # other models proceed. Both are reentrant because
+        # get_model -> load_model -> _add_model nest them.
+        self._dict_lock = threading.RLock()
+        self._locks: Dict[str, threading.RLock] = {}
+        
+        # Open lock files of the training jobs this process runs, see _lock_job
+        self._job_locks: Dict[str, IO[str]] = {}
+        
+        # Class, hyperparameters and status of every known model, loaded or not,
+        # mirrored in INDEX_FILE so saved models survive restarts
+        self._index_path = os.path.join(self.models_dir, INDEX_FILE)
+        self._index_version: Optional[Tuple[int, int, int]] = None
+        self._model_info: Dict[str, Dict[str, Any]] = {}
+        self._refresh_index()
+        logger.info("ModelService initialized with models_dir: %s", self.models_dir)
     
     def get_available_model_classes(self) -> List[str]:
         """
@@ -30,7 +124,7 @@ class ModelService:
             List of available model class names
         """
         classes = list(MODEL_REGISTRY.keys())
-        logger.info(f"Available model classes: {classes}")
+        logger.info("Available model classes: %s", classes)
         return classes
     
     def create_model(
@@ -41,6 +135,10 @@ class ModelService:
         """
         Create a new model instance.
         
+        A new model stays untrained until its training job ends, so the job
+        is marked in flight right away; end it with finish_training or
+        fail_training.
+        
         Args:
             model_class: Name of the model class
             hyperparameters: Model hyperparameters
@@ -51,86 +149,113 @@ class ModelService:
         if model_class not in MODEL_REGISTRY:
             raise ValueError(f"Unknown model class: {model_class}")
         
-        model_id = str(uuid.uuid4())
+        model_id = uuid.uuid4().hex
         model_cls = MODEL_REGISTRY[model_class]
         model = model_cls(model_id, hyperparameters)
-        self.models[model_id] = model
+        self._lock_job(model_id)
+        self._add_model(model_class, model, status='running', metrics=None, error=None)
         
-        logger.info(f"Created model {model_id} of class {model_class}")
+        logger.info("Created model %s of class %s", model_id, model_class)
         return model_id
     
-    def train_model(
-        self,
-        model_id: str,
-        dataset_path: str
-    ) -> Dict[str, Any]:
+    def start_training(self, model_id: str) -> None:
         """
-        Train a model on a dataset.
+        Mark a training job on an existing model as in flight.
+        
+        End the job with finish_training or fail_training.
         
         Args:
             model_id: ID of the model to train
-            dataset_path: Path to the training dataset
-            
-        Returns:
-            Training metrics
         """
-        if model_id not in self.models:
-            raise ValueError(f"Model {model_id} not found")
-        
-        model = self.models[model_id]
+        if not self._lock_job(model_id):
+            raise TrainingInProgressError(f"Model {model_id} is already being trained")
         
-        # Load dataset
-        logger.info(f"Loading dataset from {dataset_path}")
-        
-        if dataset_path.endswith('.csv'):
-            df = pd.read_csv(dataset_path)
-        elif dataset_path.endswith('.json'):
-            df = pd.read_json(dataset_path)
-        else:
-            raise ValueError(f"Unsupported file format. Only CSV and JSON are supported.")
+        with self._dict_lock:
+            self._refresh_index()
+            found = model_id in self._model_info
+            if found:
+                self._update_index(model_id, {'status': 'running', 'metrics': None, 'error': None})
+        if not found:
+            self._unlock_job(model_id, remove=True)
+            raise ValueError(f"Model {model_id} not found")
+    
+    def finish_training(
+        self,
+        model_id: str,
+        model_class: str,
+        metrics: Dict[str, Any]
+    ) -> BaseModel:
+        """
+        End a training job by loading the model its worker saved.
         
-        # Assume last column is target
-        X = df.iloc[:, :-1].values
-        y = df.iloc[:, -1].values
+        If this raises, the job is still in flight; end it with fail_training.
         
-        # Train model
-        metrics = model.train(X, y)
+        Args:
+            model_id: ID of the trained model
+            model_class: Model class name
+            metrics: Training metrics to record as the job result
+            
+        Returns:
+            Trained model instance
+        """
+        with self._dict_lock:
+            self._refresh_index()
+            found = model_id in self._model_info
+        if not found:
+            # Deleted by a worker that could not see the job: drop the orphaned file
+            _remove_file(os.path.join(self.models_dir, f"{model_id}.pkl"))
+            raise ValueError(f"Model {model_id} was deleted during training")
         
-        # Save model
-        model_path = os.path.join(self.models_dir, f"{model_id}.pkl")
-        model.save(model_path)
+        model = self.load_model(model_id, model_class)
+        with self._dict_lock:
+            self._update_index(model_id, {'status': 'completed', 'metrics': metrics, 'error': None})
+        self._unlock_job(model_id)
+        return model
+    
+    def fail_training(self, model_id: str, error: str) -> None:
+        """
+        End a training job that did not produce a model.
         
-        logger.info(f"Model {model_id} trained successfully. Metrics: {metrics}")
-        return metrics
+        Args:
+            model_id: ID of the model
+            error: Error to record as the job result
+        """
+        with self._dict_lock:
+            self._refresh_index()
+            if model_id in self._model_info:
+                self._update_index(model_id, {'status': 'failed', 'metrics': None, 'error': error})
+        self._unlock_job(model_id)
     
-    def predict(
+    def predict_array(
         self,
         model_id: str,
-        features: List[List[float]]
-    ) -> List[Any]:
+        X: np.ndarray
+    ) -> np.ndarray:
         """
-        Make predictions using a model.
+        Make predictions for a feature matrix without list conversions.
         
         Args:
             model_id: ID of the model
-            features: List of feature vectors
+            X: Feature matrix
             
         Returns:
-            List of predictions
+            Array of predictions
         """
-        if model_id not in self.models:
+        # get_model only locks the model to load it; predictions on a loaded model
+        # run concurrently, since retraining replaces the model instead of changing it
+        model = self.get_model(model_id)
+        if model is None:
             raise ValueError(f"Model {model_id} not found")
+        predictions = model.predict_array(X)
         
-        model = self.models[model_id]
-        X = np.array(features)
-        predictions = model.predict(X)
-        
-        logger.info(f"Made predictions with model {model_id}")
+        # Hot path: skip building the message when INFO is disabled
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Made %d predictions with model %s", len(predictions), model_id)
         return predictions
     
     def get_model(self, model_id: str) -> Optional[BaseModel]:
         """
-        Get a model by ID.
+        Get a model by ID, loading it from disk if it was evicted from memory.
         
         Args:
             model_id: Model ID
@@ -138,7 +263,75 @@ class ModelService:
         Returns:
             Model instance or None
         """
-        return self.models.get(model_id)
+        with self._dict_lock:
+            model = self.models.get(model_id)
+            if model is not None:
+                self.models.move_to_end(model_id)
+                return model
+        
+        # Concurrent misses on one model wait here and load it only once
+        with self._model_lock(model_id):
+            with self._dict_lock:
+                model = self.models.get(model_id)
+                if model is not None:
+                    return model
+                if model_id not in self._model_info:
+                    # Another worker may have created it since we last read the index
+                    self._refresh_index()
+                    if model_id not in self._model_info:
+                        return None
+                info = self._model_info[model_id]
+                if not info['is_trained']:
+                    # Still training in another worker, nothing to load yet
+                    return None
+                model_class = info['model_class']
+            
+            return self.load_model(model_id, model_class)
+    
+    def get_model_class(self, model_id: str) -> str:
+        """
+        Get the registry name of a model's class.
+        
+        Args:
+            model_id: Model ID
+            
+        Returns:
+            Model class name as used in MODEL_REGISTRY
+        """
+        with self._dict_lock:
+            if model_id not in self._model_info:
+                self._refresh_index()
+                if model_id not in self._model_info:
+                    raise ValueError(f"Model {model_id} not found")
+            
+            return self._model_info[model_id]['model_class']
+    
+    def get_model_info(self, model_id: str) -> Dict[str, Any]:
+        """
+        Get the class, status and last training job of a model without loading it.
+        
+        Args:
+            model_id: Model ID
+            
+        Returns:
+            Model information dictionary; 'status' is 'running', 'completed'
+            or 'failed', with the job's 'metrics' or 'error'
+        """
+        with self._dict_lock:
+            self._refresh_index()
+            if model_id not in self._model_info:
+                raise ValueError(f"Model {model_id} not found")
+            info = dict(self._model_info[model_id])
+        
+        # Models saved before job state was recorded
+        info.setdefault('status', 'completed' if info['is_trained'] else 'failed')
+        info.setdefault('metrics', None)
+        info.setdefault('error', None)
+        if info['status'] == 'running' and not self._job_in_flight(model_id):
+            # The worker that ran the job died before ending it
+            info['status'] = 'failed'
+            info['error'] = "Training was interrupted"
+        return info
     
     def list_models(self) -> List[Dict[str, Any]]:
         """
@@ -147,15 +340,19 @@ class ModelService:
         Returns:
             List of model information dictionaries
         """
+        with self._dict_lock:
+            self._refresh_index()
+            model_info = list(self._model_info.items())
+        
         models_info = []
-        for model_id, model in self.models.items():
+        for model_id, info in model_info:
             models_info.append({
                 'model_id': model_id,
-                'is_trained': model.is_trained,
-                'hyperparameters': model.get_hyperparameters()
+                'is_trained': info['is_trained'],
+                'hyperparameters': info['hyperparameters']
             })
         
-        logger.info(f"Listed {len(models_info)} models")
+        logger.info("Listed %d models", len(models_info))
         return models_info
     
     def delete_model(self, model_id: str) -> None:
@@ -165,26 +362,40 @@ class ModelService:
         Args:
             model_id: ID of the model to delete
         """
-        if model_id not in self.models:
-            raise ValueError(f"Model {model_id} not found")
+        # Holding the job lock keeps training from starting until the model is gone;
+        # the model lock waits for a load of this model to finish
+        if not self._lock_job(model_id):
+            raise TrainingInProgressError(f"Model {model_id} is being trained")
         
-        # Remove from memory
-        del self.models[model_id]
+        try:
+            with self._model_lock(model_id):
+                with self._dict_lock:
+                    self._refresh_index()
+                    if model_id not in self._model_info:
+                        raise ValueError(f"Model {model_id} not found")
+                    
+                    # Remove from memory and the index
+                    self._update_index(model_id, None)
+                    self._remove_loaded(model_id)
+                    self._locks.pop(model_id, None)
+                
+                # Remove from disk
+                _remove_file(os.path.join(self.models_dir, f"{model_id}.pkl"))
+        finally:
+            self._unlock_job(model_id, remove=True)
         
-        # Remove from disk
-        model_path = os.path.join(self.models_dir, f"{model_id}.pkl")
-        if os.path.exists(model_path):
-            os.remove(model_path)
-        
-        logger.info(f"Deleted model {model_id}")
+        logger.info("Deleted model %s", model_id)
     
-    def load_model(self, model_id: str, model_class: str) -> None:
+    def load_model(self, model_id: str, model_class: str) -> BaseModel:
         """
         Load a model from disk.
         
         Args:
             model_id: Model ID
             model_class: Model class name
+            
+        Returns:
+            Loaded model instance
         """
         if model_class not in MODEL_REGISTRY:
             raise ValueError(f"Unknown model class: {model_class}")
@@ -195,8 +406,270 @@ class ModelService:
         
         model_cls = MODEL_REGISTRY[model_class]
         model = model_cls(model_id, {})
-        model.load(model_path)
-        self.models[model_id] = model
+        with self._model_lock(model_id):
+            model.load(model_path)
+            self._add_model(model_class, model)
         
-        logger.info(f"Loaded model {model_id} from disk")
+        logger.info("Loaded model %s from disk", model_id)
+        return model
+    
+    def _add_model(self, model_class: str, model: BaseModel, **job: Any) -> None:
+        """
+        Add or replace a model in memory, evicting least recently used ones if needed.
+        
+        Args:
+            model_class: Model class name
+            model: Model instance
+            **job: Training job fields to record in the index
+        """
+        model_id = model.model_id
+        size = _estimate_size(model)
+        with self._dict_lock:
+            self._update_index(model_id, {
+                'model_class': model_class,
+                'is_trained': model.is_trained,
+                'hyperparameters': model.get_hyperparameters(),
+                **job
+            })
+            
+            self._remove_loaded(model_id)
+            self.models[model_id] = model
+            self._model_sizes[model_id] = size
+            self._loaded_bytes += size
+            
+            # Only trained models can be evicted: they are saved right after training
+            # and reload on demand, so nothing has to be written back here
+            for candidate_id in list(self.models):
+                if (self._loaded_bytes <= self._max_loaded_bytes
+                        and len(self.models) <= self._max_loaded_models):
+                    break
+                if candidate_id == model_id or not self.models[candidate_id].is_trained:
+                    continue
+                self._remove_loaded(candidate_id)
+                logger.info("Evicted model %s from memory", candidate_id)
+    
+    @contextmanager
+    def _index_lock(self):
+        """Hold an exclusive lock on the index file across processes."""
+        with open(f"{self._index_path}.lock", 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+    
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Read the index file.
+        
+        Returns:
+            Model info by model ID
+        """
+        try:
+            # Record the version first: a concurrent rewrite then only causes a re-read
+            version = _file_version(self._index_path)
+            with open(self._index_path) as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return {}
+        self._index_version = version
+        return index
+    
+    def _refresh_index(self) -> None:
+        """Reload model info if the index file changed since it was last read."""
+        with self._dict_lock:
+            try:
+                version = _file_version(self._index_path)
+            except FileNotFoundError:
+                return
+            if version != self._index_version:
+                self._model_info = self._read_index()
+    
+    def _update_index(self, model_id: str, info: Optional[Dict[str, Any]]) -> None:
+        """
+        Update or remove one model's info and write the index file.
+        
+        The file is re-read under the lock so entries written by other
+        workers are kept, then replaced atomically.
+        
+        Args:
+            model_id: Model ID
+            info: Fields to set on the model's info, or None to remove the model
+        """
+        with self._dict_lock, self._index_lock():
+            index = self._read_index()
+            if info is None:
+                index.pop(model_id, None)
+            else:
+                index[model_id] = {**index.get(model_id, {}), **info}
+            
+            tmp_path = f"{self._index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(index, f)
+            os.replace(tmp_path, self._index_path)
+            self._index_version = _file_version(self._index_path)
+            self._model_info = index
+    
+    def _model_lock(self, model_id: str) -> threading.RLock:
+        """
+        Get the lock serializing work on one model, creating it on first use.
+        
+        Args:
+            model_id: Model ID
+            
+        Returns:
+            Reentrant lock for the model
+        """
+        with self._dict_lock:
+            return self._locks.setdefault(model_id, threading.RLock())
+    
+    def _lock_job(self, model_id: str) -> bool:
+        """
+        Mark a training job on a model as in flight, unless one already is.
+        
+        The job holds an exclusive lock on a per-model file until it ends.
+        The lock goes away with the process, so a worker that died mid-training
+        does not block the model forever.
+        
+        Args:
+            model_id: Model ID
+            
+        Returns:
+            Whether the job was marked in flight
+        """
+        with self._dict_lock:
+            if model_id in self._job_locks:
+                return False
+            lock_file = open(self._job_lock_path(model_id), 'w')
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    lock_file.close()
+                    return False
+            self._job_locks[model_id] = lock_file
+            return True
+    
+    def _unlock_job(self, model_id: str, remove: bool = False) -> None:
+        """
+        Mark the training job on a model as ended.
+        
+        Args:
+            model_id: Model ID
+            remove: Also remove the lock file, once the model is gone
+        """
+        with self._dict_lock:
+            lock_file = self._job_locks.pop(model_id, None)
+        if lock_file is None:
+            return
+        if remove:
+            _remove_file(self._job_lock_path(model_id))
+        lock_file.close()
+    
+    def _job_in_flight(self, model_id: str) -> bool:
+        """
+        Check whether any worker is running a training job on a model.
+        
+        Args:
+            model_id: Model ID
+            
+        Returns:
+            Whether a training job is in flight
+        """
+        if model_id in self._job_locks:
+            return True
+        if fcntl is None:
+            return False
+        try:
+            lock_file = open(self._job_lock_path(model_id))
+        except FileNotFoundError:
+            return False
+        with lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_SH | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return True
+        return False
+    
+    def _job_lock_path(self, model_id: str) -> str:
+        """
+        Get the path of the file locked while a model is being trained.
+        
+        Args:
+            model_id: Model ID
+            
+        Returns:
+            Path to the lock file
+        """
+        return os.path.join(self.models_dir, f"{model_id}.lock")
+    
+    def _remove_loaded(self, model_id: str) -> None:
+        """
+        Drop a model from memory without forgetting it.
+        
+        Must be called with _dict_lock held.
+        
+        Args:
+            model_id: Model ID
+        """
+        if self.models.pop(model_id, None) is not None:
+            self._loaded_bytes -= self._model_sizes.pop(model_id)
+
+
+def _file_version(path: str) -> Tuple[int, int, int]:
+    """
+    Identify a version of a file that is replaced atomically on every write.
+    
+    The inode changes with each replacement, which catches rewrites that
+    land within the same mtime tick.
+    
+    Args:
+        path: Path to the file
+        
+    Returns:
+        Inode, modification time and size
+    """
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
 
+
+def _remove_file(path: str) -> None:
+    """
+    Remove a file if it exists.
+    
+    Args:
+        path: Path to the file
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class _SizePickler(pickle.Pickler):
+    """Pickler that adds up the size of arrays instead of serializing them."""
+    
+    def __init__(self, file):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.array_bytes = 0
+    
+    def reducer_override(self, obj):
+        # Memory-mapped arrays are measured too, without paging them in
+        if isinstance(obj, np.ndarray):
+            self.array_bytes += obj.nbytes
+            return int, ()
+        return NotImplemented
+
+
+def _estimate_size(model: BaseModel) -> int:
+    """
+    Estimate the in-memory size of a model's estimator.
+    
+    Args:
+        model: Model instance
+        
+    Returns:
+        Approximate size in bytes
+    """
+    stream = io.BytesIO()
+    pickler = _SizePickler(stream)
+    pickler.dump(model.model)
+    return stream.tell() + pickler.array_bytes
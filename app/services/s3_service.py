@@ -1,21 +1,38 @@
 """Service for working with S3/MinIO."""
 
-import boto3
-from botocore.client import Config
-from typing import Optional
+from functools import lru_cache
+from typing import Iterator, Optional
 from app.config import settings
 from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Connections kept open per client; boto3 clients are thread-safe and share this pool
+MAX_POOL_CONNECTIONS = 64
+
+# Files above MULTIPART_SIZE are transferred in parts of that size, several at once
+MULTIPART_SIZE = 8 << 20
+MAX_PART_CONCURRENCY = 16
+
 
 class S3Service:
     """Service for managing files in S3/MinIO."""
     
     def __init__(self):
         """Initialize the S3 service."""
+        # boto3 takes long to import and most processes never touch S3
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+        from botocore.client import Config
+        
         self.s3_client = None
         self.bucket_name = settings.minio_bucket
+        self._transfer_config = TransferConfig(
+            multipart_threshold=MULTIPART_SIZE,
+            multipart_chunksize=MULTIPART_SIZE,
+            max_concurrency=MAX_PART_CONCURRENCY,
+            use_threads=True
+        )
         
         try:
             self.s3_client = boto3.client(
@@ -23,7 +40,12 @@ class S3Service:
                 endpoint_url=f"http://{settings.minio_endpoint}",
                 aws_access_key_id=settings.minio_access_key,
                 aws_secret_access_key=settings.minio_secret_key,
-                config=Config(signature_version='s3v4'),
+                config=Config(
+                    signature_version='s3v4',
+                    max_pool_connections=MAX_POOL_CONNECTIONS,
+                    retries={'max_attempts': 3, 'mode': 'adaptive'},
+                    tcp_keepalive=True
+                ),
                 use_ssl=settings.minio_use_ssl
             )
             
@@ -32,11 +54,11 @@ class S3Service:
                 self.s3_client.head_bucket(Bucket=self.bucket_name)
             except:
                 self.s3_client.create_bucket(Bucket=self.bucket_name)
-                logger.info(f"Created bucket {self.bucket_name}")
+                logger.info("Created bucket %s", self.bucket_name)
             
-            logger.info(f"S3Service initialized with bucket {self.bucket_name}")
+            logger.info("S3Service initialized with bucket %s", self.bucket_name)
         except Exception as e:
-            logger.warning(f"Failed to initialize S3 service: {e}")
+            logger.warning("Failed to initialize S3 service: %s", e)
     
     def upload_file(self, local_path: str, s3_key: str) -> bool:
         """
@@ -54,11 +76,16 @@ class S3Service:
             return False
         
         try:
-            self.s3_client.upload_file(local_path, self.bucket_name, s3_key)
-            logger.info(f"Uploaded {local_path} to s3://{self.bucket_name}/{s3_key}")
+            self.s3_client.upload_file(
+                local_path,
+                self.bucket_name,
+                s3_key,
+                Config=self._transfer_config
+            )
+            logger.info("Uploaded %s to s3://%s/%s", local_path, self.bucket_name, s3_key)
             return True
         except Exception as e:
-            logger.error(f"Error uploading file to S3: {e}")
+            logger.error("Error uploading file to S3: %s", e)
             return False
     
     def download_file(self, s3_key: str, local_path: str) -> bool:
@@ -77,40 +104,53 @@ class S3Service:
             return False
         
         try:
-            self.s3_client.download_file(self.bucket_name, s3_key, local_path)
-            logger.info(f"Downloaded s3://{self.bucket_name}/{s3_key} to {local_path}")
+            self.s3_client.download_file(
+                self.bucket_name,
+                s3_key,
+                local_path,
+                Config=self._transfer_config
+            )
+            logger.info("Downloaded s3://%s/%s to %s", self.bucket_name, s3_key, local_path)
             return True
         except Exception as e:
-            logger.error(f"Error downloading file from S3: {e}")
+            logger.error("Error downloading file from S3: %s", e)
             return False
     
-    def list_files(self, prefix: str = "") -> list:
+    def list_files(self, prefix: str = "") -> Iterator[str]:
         """
         List files in S3 bucket.
         
+        Keys are fetched a page (up to 1000 keys) at a time, so buckets of
+        any size can be listed without holding every key in memory.
+        
         Args:
             prefix: Prefix to filter files
             
-        Returns:
-            List of file keys
+        Yields:
+            File keys
         """
         if not self.s3_client:
             logger.warning("S3 client not initialized")
-            return []
+            return
         
         try:
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=prefix
-            )
-            
-            if 'Contents' in response:
-                return [obj['Key'] for obj in response['Contents']]
-            return []
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+                for obj in page.get('Contents', ()):
+                    yield obj['Key']
         except Exception as e:
-            logger.error(f"Error listing files in S3: {e}")
-            return []
-
-
+            logger.error("Error listing files in S3: %s", e)
 
 
+@lru_cache(maxsize=None)
+def get_s3_service() -> S3Service:
+    """
+    Get the process-wide S3 service, creating it on first use.
+    
+    Sharing one client keeps its pooled connections alive across requests
+    instead of paying a TCP/TLS handshake for every new service.
+    
+    Returns:
+        S3 service
+    """
+    return S3Service()
@@ -0,0 +1,397 @@
+"""Dataset loading helpers."""
+
+import hashlib
+import os
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from app.config import settings
+from app.utils.logger import setup_logger
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = setup_logger(__name__)
+
+# Try to use pyarrow's multi-threaded CSV parser, fall back to pandas
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    logger.warning("pyarrow not available, using pandas CSV parser. Install with: pip install pyarrow")
+
+HASH_CHUNK_SIZE = 1 << 20
+
+# Bytes of CSV pyarrow parses per block; blocks are parsed in parallel
+CSV_BLOCK_SIZE = 8 << 20
+
+# Extensions load_dataset can read
+SUPPORTED_EXTENSIONS = ('.csv', '.json', '.jsonl', '.parquet', '.h5', '.hdf5')
+
+# Subdirectory of the datasets directory holding Parquet copies of CSV datasets
+PARQUET_CACHE_DIR = '.parquet'
+
+# Parsed datasets of this process, keyed by content digest and feature columns,
+# least recently used first. Training runs in the API workers' process pools, so
+# each pool process has its own copy and a hit needs the same process to train
+# on the same data again; the Parquet cache on disk is shared by all of them.
+_dataset_cache: "OrderedDict[Tuple[str, Optional[Tuple[str, ...]]], Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+
+# Content digest of each file, valid while its (mtime, size) is unchanged
+_file_digests: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+
+def load_dataset(
+    dataset_path: str,
+    feature_columns: Optional[List[str]] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Load a dataset and split it into features and target.
+
+    The last column is the target. Results are cached per process by file
+    content, so training repeatedly on the same data skips parsing, even if
+    the file was copied or touched in between. The cache is not shared
+    between training processes: with several TRAINING_WORKERS a job may
+    land in a process that has not seen the file yet. Enable
+    DATASET_PARQUET_CACHE to let those processes skip CSV parsing too.
+
+    CSV and JSON Lines files are read in chunks into a preallocated
+    feature matrix, so peak memory stays close to the size of the result.
+    Plain JSON has no streaming reader and is loaded at once. Parquet is
+    read column by column, so columns left out of feature_columns are never
+    decoded. Features are stored as float32 and integer labels in the
+    smallest fitting type.
+
+    Args:
+        dataset_path: Path to the dataset (CSV, JSON, JSON Lines, Parquet or HDF5)
+        feature_columns: Names of the feature columns to use (default: all but the target)
+
+    Returns:
+        Tuple of feature matrix and target vector (read-only)
+    """
+    key = (_file_digest(dataset_path), tuple(feature_columns) if feature_columns else None)
+    if key in _dataset_cache:
+        _dataset_cache.move_to_end(key)
+        logger.info("Using cached dataset %s", dataset_path)
+        return _dataset_cache[key]
+
+    logger.info("Loading dataset from %s", dataset_path)
+
+    if dataset_path.endswith(('.jsonl', '.json', '.h5', '.hdf5')):
+        # pandas is slow to import and only needed for these formats
+        import pandas as pd
+
+    if dataset_path.endswith('.csv') and settings.dataset_parquet_cache and PYARROW_AVAILABLE:
+        X, y = _read_parquet(convert_to_parquet(dataset_path), feature_columns)
+    elif dataset_path.endswith('.csv'):
+        X, y = _fill_arrays(_iter_csv(dataset_path, feature_columns), _count_lines(dataset_path))
+    elif dataset_path.endswith('.jsonl'):
+        with pd.read_json(dataset_path, lines=True, chunksize=settings.dataset_chunk_rows) as chunks:
+            X, y = _fill_arrays(_iter_frames(chunks, feature_columns), _count_lines(dataset_path) + 1)
+    elif dataset_path.endswith('.json'):
+        X, y = _split_frame(pd.read_json(dataset_path), feature_columns)
+    elif dataset_path.endswith('.parquet'):
+        X, y = _read_parquet(dataset_path, feature_columns)
+    elif dataset_path.endswith(('.h5', '.hdf5')):
+        X, y = _split_frame(pd.read_hdf(dataset_path), feature_columns)
+    else:
+        raise ValueError(
+            f"Unsupported file format. Only CSV, JSON, JSON Lines, Parquet and HDF5 are supported."
+        )
+
+    y = _downcast_labels(y)
+
+    # Cached arrays are shared between training runs, so protect them from mutation
+    X.flags.writeable = False
+    y.flags.writeable = False
+
+    if settings.dataset_cache_size > 0:
+        _dataset_cache[key] = (X, y)
+        while len(_dataset_cache) > settings.dataset_cache_size:
+            _dataset_cache.popitem(last=False)
+    return X, y
+
+
+def _file_digest(path: str) -> str:
+    """
+    Get the SHA-256 digest of a file's content.
+
+    The digest is only recomputed when the file's mtime or size changes.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Hex digest of the file content
+    """
+    stat = os.stat(path)
+    path = os.path.abspath(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _file_digests.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    _file_digests[path] = (version, digest.hexdigest())
+    return _file_digests[path][1]
+
+
+def _count_lines(path: str) -> int:
+    """
+    Count newlines in a file, an upper bound on the rows of a CSV after its header.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Number of newline characters
+    """
+    lines = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            lines += chunk.count(b'\n')
+    return lines
+
+
+def _iter_csv(
+    dataset_path: str,
+    feature_columns: Optional[List[str]] = None
+) -> Iterator[Tuple[List[np.ndarray], np.ndarray]]:
+    """
+    Read a CSV file in chunks.
+
+    Args:
+        dataset_path: Path to the CSV file
+        feature_columns: Names of the feature columns to read (default: all but the last)
+
+    Yields:
+        Tuple of feature columns and target values for each chunk
+    """
+    if not PYARROW_AVAILABLE:
+        import pandas as pd
+
+        names = list(pd.read_csv(dataset_path, nrows=0).columns)
+        columns = _select_columns(names, feature_columns)
+        dtype = {name: np.float32 for name in columns[:-1]}
+        with pd.read_csv(
+            dataset_path,
+            usecols=columns,
+            dtype=dtype,
+            chunksize=settings.dataset_chunk_rows
+        ) as chunks:
+            yield from _iter_frames(chunks, columns=columns)
+        return
+
+    # Types are inferred from the first block only, so pin feature columns to
+    # float32 to keep later blocks (e.g. "1.5" after integers) from failing
+    with pa_csv.open_csv(dataset_path) as reader:
+        names = reader.schema.names
+    columns = _select_columns(names, feature_columns)
+    convert_options = pa_csv.ConvertOptions(
+        column_types={name: pa.float32() for name in columns[:-1]},
+        include_columns=columns
+    )
+    with pa_csv.open_csv(
+        dataset_path,
+        read_options=_csv_read_options(),
+        convert_options=convert_options
+    ) as reader:
+        for batch in reader:
+            columns = [column.to_numpy(zero_copy_only=False) for column in batch.columns]
+            yield columns[:-1], columns[-1]
+
+
+def _csv_read_options() -> "pa_csv.ReadOptions":
+    """
+    Get pyarrow CSV read options for multi-threaded parsing in large blocks.
+
+    Returns:
+        Read options
+    """
+    return pa_csv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE)
+
+
+def _iter_frames(
+    frames,
+    feature_columns: Optional[List[str]] = None,
+    columns: Optional[List[str]] = None
+) -> Iterator[Tuple[List[np.ndarray], np.ndarray]]:
+    """
+    Split pandas DataFrame chunks into feature columns and target values.
+
+    Args:
+        frames: Iterable of DataFrames
+        feature_columns: Names of the feature columns to use (default: all but the last)
+        columns: Feature and target column names, if already selected
+
+    Yields:
+        Tuple of feature columns and target values for each chunk
+    """
+    for df in frames:
+        if columns is None:
+            columns = _select_columns(list(df.columns), feature_columns)
+        arrays = [df[name].to_numpy() for name in columns]
+        yield arrays[:-1], arrays[-1]
+
+
+def _select_columns(names: List[str], feature_columns: Optional[List[str]]) -> List[str]:
+    """
+    Get the feature columns followed by the target (last) column.
+
+    Args:
+        names: All column names of the dataset
+        feature_columns: Names of the feature columns to use (default: all but the last)
+
+    Returns:
+        Column names to read, target last
+    """
+    names = [str(name) for name in names]
+    if not feature_columns:
+        return names
+    missing = [name for name in feature_columns if name not in names]
+    if missing:
+        raise ValueError(f"Feature columns not found in dataset: {missing}")
+    return list(feature_columns) + [names[-1]]
+
+
+def _split_frame(df: "pd.DataFrame", feature_columns: Optional[List[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split a fully loaded DataFrame into features and target.
+
+    Args:
+        df: Dataset with the target in the last column
+        feature_columns: Names of the feature columns to use (default: all but the last)
+
+    Returns:
+        Tuple of feature matrix and target vector
+    """
+    df.columns = [str(name) for name in df.columns]
+    columns = _select_columns(list(df.columns), feature_columns)
+    X = df[columns[:-1]].to_numpy(dtype=np.float32, copy=False)
+    y = df[columns[-1]].to_numpy(copy=False)
+    return X, y
+
+
+def _read_parquet(dataset_path: str, feature_columns: Optional[List[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read a Parquet file, decoding only the selected feature columns and the target.
+
+    Args:
+        dataset_path: Path to the Parquet file
+        feature_columns: Names of the feature columns to use (default: all but the last)
+
+    Returns:
+        Tuple of feature matrix and target vector
+    """
+    if not PYARROW_AVAILABLE:
+        import pandas as pd
+
+        return _split_frame(pd.read_parquet(dataset_path), feature_columns)
+
+    parquet_file = pq.ParquetFile(dataset_path)
+    columns = _select_columns(parquet_file.schema_arrow.names, feature_columns)
+    batches = (
+        (
+            [batch.column(j).to_numpy(zero_copy_only=False) for j in range(len(columns) - 1)],
+            batch.column(len(columns) - 1).to_numpy(zero_copy_only=False)
+        )
+        for batch in parquet_file.iter_batches(batch_size=settings.dataset_chunk_rows, columns=columns)
+    )
+    return _fill_arrays(batches, parquet_file.metadata.num_rows)
+
+
+def convert_to_parquet(csv_path: str) -> str:
+    """
+    Get a Parquet copy of a CSV dataset, converting it on first use.
+
+    Copies live in a hidden directory under the datasets directory and are
+    named by the CSV's content digest, so edits to the CSV produce a new copy.
+
+    Args:
+        csv_path: Path to the CSV file
+
+    Returns:
+        Path to the Parquet file
+    """
+    cache_dir = os.path.join(settings.datasets_dir, PARQUET_CACHE_DIR)
+    parquet_path = os.path.join(cache_dir, f"{_file_digest(csv_path)}.parquet")
+    if os.path.exists(parquet_path):
+        return parquet_path
+
+    logger.info("Converting %s to Parquet", csv_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    with pa_csv.open_csv(csv_path) as reader:
+        names = reader.schema.names
+    convert_options = pa_csv.ConvertOptions(
+        column_types={name: pa.float32() for name in names[:-1]}
+    )
+
+    # Write to a temporary file first so other processes never see a partial copy
+    tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+    with pa_csv.open_csv(
+        csv_path,
+        read_options=_csv_read_options(),
+        convert_options=convert_options
+    ) as reader:
+        with pq.ParquetWriter(tmp_path, reader.schema) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+    os.replace(tmp_path, parquet_path)
+    return parquet_path
+
+
+def _fill_arrays(chunks, capacity: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Copy chunks of a dataset into a single preallocated feature matrix.
+
+    Args:
+        chunks: Iterable of (feature columns, target values) tuples
+        capacity: Expected upper bound on the number of rows
+
+    Returns:
+        Tuple of feature matrix and target vector
+    """
+    X = None
+    targets = []
+    offset = 0
+    for columns, target in chunks:
+        rows = len(target)
+        if X is None:
+            X = np.empty((max(capacity, rows), len(columns)), dtype=np.float32)
+        elif offset + rows > X.shape[0]:
+            # Capacity was underestimated (e.g. '\r' line endings); grow geometrically
+            X = np.concatenate([X[:offset], np.empty((max(offset, rows), X.shape[1]), dtype=X.dtype)])
+        for j, column in enumerate(columns):
+            X[offset:offset + rows, j] = column
+        targets.append(target)
+        offset += rows
+
+    if X is None:
+        raise ValueError("Dataset is empty")
+    return X[:offset], np.concatenate(targets)
+
+
+def _downcast_labels(y: np.ndarray) -> np.ndarray:
+    """
+    Store integer labels in the smallest integer type that holds them.
+
+    Args:
+        y: Target values
+
+    Returns:
+        Target values, downcast if integer
+    """
+    if y.dtype.kind not in 'iu' or y.size == 0:
+        return y
+    low, high = y.min(), y.max()
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return y.astype(dtype)
+    return y
@@ -6,6 +6,13 @@ from pythonjsonlogger import jsonlogger
 from app.config import settings
 
 
+# One handler shared by all application loggers
+_HANDLER = logging.StreamHandler(sys.stdout)
+_HANDLER.setFormatter(jsonlogger.JsonFormatter(
+    "%(asctime)s %(name)s %(levelname)s %(message)s"
+))
+
+
 def setup_logger(name: str) -> logging.Logger:
     """
     Set up a logger with JSON formatting.
@@ -19,19 +26,9 @@ def setup_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, settings.log_level.upper()))
     
-    # Remove existing handlers
-    logger.handlers = []
-    
-    # Create console handler with JSON formatter
-    handler = logging.StreamHandler(sys.stdout)
-    formatter = jsonlogger.JsonFormatter(
-        "%(asctime)s %(name)s %(levelname)s %(message)s"
-    )
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    # Attach the shared JSON handler once; don't also emit through ancestor handlers
+    if _HANDLER not in logger.handlers:
+        logger.addHandler(_HANDLER)
+    logger.propagate = False
     
     return logger
-
-
-
-
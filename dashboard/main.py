@@ -2,8 +2,9 @@
 
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 import json
-import pandas as pd
+import time
 from typing import Dict, Any, List
 
 # Configuration
@@ -18,20 +19,57 @@ st.set_page_config(
 
 st.title("🤖 MLOps Model Management Dashboard")
 
+# Seconds API listings are reused across reruns
+LISTING_TTL = 5
+
+# Rows sent per request when predicting for an uploaded CSV
+PREDICT_CHUNK_ROWS = 10_000
+
+# Seconds between training status checks, and before giving up on a training job
+TRAINING_POLL_INTERVAL = 1.0
+TRAINING_TIMEOUT = float(os.getenv("TRAINING_TIMEOUT", "3600"))
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """Get an HTTP session whose connections to the API are reused across reruns."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+SESSION = get_session()
+
+
+def wait_for_training(model_id: str) -> requests.Response:
+    """Poll a training job until it finishes and return the response with its result."""
+    deadline = time.monotonic() + TRAINING_TIMEOUT
+    while True:
+        response = SESSION.get(f"{API_BASE_URL}/models/{model_id}/status", timeout=5)
+        if response.status_code != 200 or response.json()["status"] != "running":
+            break
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"model {model_id} is still training after {TRAINING_TIMEOUT:.0f} s")
+        time.sleep(TRAINING_POLL_INTERVAL)
+    return SESSION.get(f"{API_BASE_URL}/models/{model_id}/result", timeout=5)
+
 
 def check_api_health() -> bool:
     """Check if API is available."""
     try:
-        response = requests.get(f"{API_BASE_URL}/health", timeout=5)
+        response = SESSION.get(f"{API_BASE_URL}/health", timeout=5)
         return response.status_code == 200
     except:
         return False
 
 
+@st.cache_data(ttl=LISTING_TTL, show_spinner=False)
 def get_available_models() -> List[str]:
     """Get list of available model classes."""
     try:
-        response = requests.get(f"{API_BASE_URL}/models/available", timeout=5)
+        response = SESSION.get(f"{API_BASE_URL}/models/available", timeout=5)
         if response.status_code == 200:
             return response.json()["model_classes"]
         return []
@@ -39,10 +77,11 @@ def get_available_models() -> List[str]:
         return []
 
 
+@st.cache_data(ttl=LISTING_TTL, show_spinner=False)
 def get_trained_models() -> List[Dict[str, Any]]:
     """Get list of trained models."""
     try:
-        response = requests.get(f"{API_BASE_URL}/models", timeout=5)
+        response = SESSION.get(f"{API_BASE_URL}/models", timeout=5)
         if response.status_code == 200:
             return response.json()["models"]
         return []
@@ -50,10 +89,11 @@ def get_trained_models() -> List[Dict[str, Any]]:
         return []
 
 
+@st.cache_data(ttl=LISTING_TTL, show_spinner=False)
 def get_datasets() -> List[Dict[str, Any]]:
     """Get list of datasets."""
     try:
-        response = requests.get(f"{API_BASE_URL}/datasets", timeout=5)
+        response = SESSION.get(f"{API_BASE_URL}/datasets", timeout=5)
         if response.status_code == 200:
             return response.json()["datasets"]
         return []
@@ -68,6 +108,9 @@ tab = st.sidebar.radio(
     ["Datasets", "Training", "Inference"]
 )
 
+if st.sidebar.button("🔄 Refresh"):
+    st.cache_data.clear()
+
 # Check API health
 if not check_api_health():
     st.error("⚠️ API service is not available. Please make sure the API is running.")
@@ -82,8 +125,10 @@ if tab == "Datasets":
     datasets = get_datasets()
     
     if datasets:
-        df = pd.DataFrame(datasets)
-        st.dataframe(df[["name", "size"]], use_container_width=True)
+        st.dataframe(
+            [{"name": d["name"], "size": d["size"]} for d in datasets],
+            use_container_width=True
+        )
         
         # Delete dataset
         st.subheader("Delete Dataset")
@@ -102,15 +147,15 @@ if tab == "Datasets":
     # Upload dataset
     st.subheader("Upload New Dataset")
     uploaded_file = st.file_uploader(
-        "Choose a CSV or JSON file",
-        type=["csv", "json"]
+        "Choose a dataset file",
+        type=["csv", "json", "jsonl", "parquet", "h5", "hdf5"]
     )
     
     if uploaded_file is not None:
         if st.button("Upload Dataset"):
             try:
                 files = {"file": (uploaded_file.name, uploaded_file, uploaded_file.type)}
-                response = requests.post(
+                response = SESSION.post(
                     f"{API_BASE_URL}/datasets/upload",
                     files=files,
                     timeout=30
@@ -119,6 +164,7 @@ if tab == "Datasets":
                 if response.status_code == 200:
                     result = response.json()
                     st.success(f"✅ Dataset uploaded: {result['dataset_name']}")
+                    get_datasets.clear()
                     st.rerun()
                 else:
                     st.error(f"Error: {response.text}")
@@ -165,14 +211,18 @@ elif tab == "Training":
                 }
                 
                 with st.spinner("Training model..."):
-                    response = requests.post(
+                    response = SESSION.post(
                         f"{API_BASE_URL}/models/train",
                         json=request_data,
-                        timeout=300
+                        timeout=30
                     )
+                    if response.status_code == 202:
+                        get_trained_models.clear()
+                        response = wait_for_training(response.json()["model_id"])
                 
                 if response.status_code == 200:
                     result = response.json()
+                    get_trained_models.clear()
                     st.success(f"✅ Model trained successfully!")
                     st.json(result)
                 else:
@@ -189,8 +239,7 @@ elif tab == "Training":
     trained_models = get_trained_models()
     
     if trained_models:
-        df = pd.DataFrame(trained_models)
-        st.dataframe(df, use_container_width=True)
+        st.dataframe(trained_models, use_container_width=True)
         
         # Retrain model
         st.subheader("Retrain Model")
@@ -220,14 +269,17 @@ elif tab == "Training":
                         request_data["hyperparameters"] = new_hyperparameters
                     
                     with st.spinner("Retraining model..."):
-                        response = requests.post(
+                        response = SESSION.post(
                             f"{API_BASE_URL}/models/{selected_model_id}/retrain",
                             json=request_data,
-                            timeout=300
+                            timeout=30
                         )
+                        if response.status_code == 202:
+                            response = wait_for_training(selected_model_id)
                     
                     if response.status_code == 200:
                         result = response.json()
+                        get_trained_models.clear()
                         st.success(f"✅ Model retrained successfully!")
                         st.json(result)
                     else:
@@ -281,7 +333,7 @@ elif tab == "Inference":
                     "features": [features]
                 }
                 
-                response = requests.post(
+                response = SESSION.post(
                     f"{API_BASE_URL}/models/{selected_model_id}/predict",
                     json=request_data,
                     timeout=30
@@ -300,35 +352,45 @@ elif tab == "Inference":
         uploaded_file = st.file_uploader("Upload CSV with features", type=["csv"])
         
         if uploaded_file is not None:
+            # Only this branch needs pandas, so import it here
+            import pandas as pd
+            
             df = pd.read_csv(uploaded_file)
             st.dataframe(df, use_container_width=True)
             
             if st.button("Predict", type="primary"):
                 try:
-                    # Convert DataFrame to list of lists
-                    features = df.values.tolist()
+                    # Send rows in chunks to bound request size and memory
+                    predictions = [None] * len(df)
+                    progress = st.progress(0.0, text="Making predictions...")
+                    failed = False
                     
-                    request_data = {
-                        "features": features
-                    }
-                    
-                    with st.spinner("Making predictions..."):
-                        response = requests.post(
+                    for start in range(0, len(df), PREDICT_CHUNK_ROWS):
+                        end = min(start + PREDICT_CHUNK_ROWS, len(df))
+                        request_data = {
+                            "features": df.iloc[start:end].to_numpy().tolist()
+                        }
+                        
+                        response = SESSION.post(
                             f"{API_BASE_URL}/models/{selected_model_id}/predict",
                             json=request_data,
                             timeout=30
                         )
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        predictions = result["predictions"]
                         
+                        if response.status_code != 200:
+                            st.error(f"Error: {response.text}")
+                            failed = True
+                            break
+                        
+                        predictions[start:end] = response.json()["predictions"]
+                        progress.progress(end / len(df), text=f"Predicted {end} of {len(df)} rows")
+                    
+                    progress.empty()
+                    if not failed:
                         # Add predictions to dataframe
                         df["prediction"] = predictions
                         st.success("✅ Predictions successful!")
                         st.dataframe(df, use_container_width=True)
-                    else:
-                        st.error(f"Error: {response.text}")
                 except Exception as e:
                     st.error(f"Error making predictions: {e}")
 
@@ -1,110 +1,457 @@
 """gRPC client for testing ML model service."""
 
-import json
+import asyncio
+import itertools
+import sys
+import time
+import warnings
+from typing import Awaitable, Dict, List, Optional
+import orjson
 import grpc
-from app.grpc_server import mlops_pb2, mlops_pb2_grpc
+import numpy as np
+from google.protobuf.internal import api_implementation
+from protos import mlops_pb2, mlops_pb2_grpc
 
+# Large responses are parsed in native code by the upb backend of protobuf>=4.21;
+# the pure-Python fallback parses repeated fields element by element
+if api_implementation.Type() == "python":
+    warnings.warn(
+        "protobuf is using its pure-Python implementation, which parses responses slowly. "
+        "Unset PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION or upgrade protobuf."
+    )
 
-def test_grpc_service(server_address: str = "localhost:50051"):
+# Keep the HTTP/2 connection alive between calls instead of re-handshaking,
+# allow large Train/Predict payloads, and size the flow-control window and
+# write buffer so big messages stream without waiting on window updates
+CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", 10000),
+    ("grpc.keepalive_timeout_ms", 5000),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.max_receive_message_length", 256 << 20),
+    ("grpc.max_send_message_length", 256 << 20),
+    ("grpc.http2.lookahead_bytes", 16 << 20),
+    ("grpc.http2.write_buffer_size", 1 << 20),
+]
+
+# Seconds to wait for the connection before the first call
+CONNECT_TIMEOUT = 5
+
+# Seconds to wait for each probe's response
+RPC_TIMEOUT = 10
+
+# Compression for the potentially large Train and Predict requests; the
+# small probe requests are not worth compressing
+REQUEST_COMPRESSION = grpc.Compression.Gzip
+
+# Attempts for calls that fail because the server is unavailable, and the
+# delay before the first retry in seconds (doubled after each attempt)
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 0.5
+
+# Predictions printed per response; the rest are only counted
+PREDICTIONS_SHOWN = 8
+
+# Requests sent by the streaming Predict test
+STREAM_BATCHES = 100
+
+# Test fixtures, interned so every request reuses the same string objects;
+# change them to an actual dataset and model
+MODEL_CLASS = sys.intern("random_forest")
+DATASET_NAME = sys.intern("test_dataset.csv")
+MODEL_ID = sys.intern("test_model_id")
+
+# Example Random Forest hyperparameters, serialized once at import
+HYPERPARAMETERS_JSON = orjson.dumps({
+    "n_estimators": 10,
+    "max_depth": 5,
+    "task_type": "classification"
+}).decode()
+
+# Requests without fields, built once and shared by every call
+_EMPTY = mlops_pb2.Empty()
+_HEALTH = mlops_pb2.HealthRequest()
+
+# Create, serialize and parse every message type once at import, so lazy
+# descriptor and class setup is not charged to the first timed call
+for _name in mlops_pb2.DESCRIPTOR.message_types_by_name:
+    _message_type = getattr(mlops_pb2, _name)
+    _message_type.FromString(_message_type().SerializeToString())
+
+# Independent read-only probes: label, stub method, request, and a formatter
+# turning the response into output lines
+PROBES = (
+    ("Health Check", "HealthCheck", _HEALTH, lambda response: [
+        f"Status: {response.status}",
+        f"Version: {response.version}"
+    ]),
+    ("Get Available Models", "GetAvailableModels", _EMPTY, lambda response: [
+        f"Available model classes: {list(response.model_classes)}"
+    ]),
+    ("List Datasets", "ListDatasets", _EMPTY, lambda response: [
+        f"Found {len(response.datasets)} datasets:",
+        *(f"  - {dataset.name} ({dataset.size} bytes)" for dataset in response.datasets)
+    ]),
+    ("List Models", "ListModels", _EMPTY, lambda response: [
+        f"Found {len(response.models)} models:",
+        *(f"  - {model.model_id} (trained: {model.is_trained})" for model in response.models)
+    ]),
+)
+
+# Channels (TCP connections) that calls are spread over
+POOL_SIZE = 4
+
+
+# Hosts that get local channel credentials instead of TLS
+LOOPBACK_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+
+def channel_credentials(server_address: str, use_tls: bool = False) -> Optional[grpc.ChannelCredentials]:
     """
-    Test the gRPC service.
+    Choose credentials for a server address.
+    
+    Loopback and Unix socket addresses use local credentials, which skip
+    the TLS handshake and encryption but go through the same secure channel
+    path as production. Remote servers use TLS when requested.
     
     Args:
         server_address: Address of the gRPC server
+        use_tls: Use TLS for remote servers
+        
+    Returns:
+        Channel credentials, or None for an insecure channel
     """
-    print(f"Connecting to gRPC server at {server_address}...")
+    if server_address.startswith("unix:"):
+        return grpc.local_channel_credentials(grpc.LocalConnectionType.UDS)
+    host = server_address.rsplit(":", 1)[0].strip("[]")
+    if host in LOOPBACK_HOSTS:
+        return grpc.local_channel_credentials()
+    if use_tls:
+        return grpc.ssl_channel_credentials()
+    return None
+
+
+class ChannelPool:
+    """Channels to one server with round-robin stub selection."""
     
-    with grpc.insecure_channel(server_address) as channel:
-        stub = mlops_pb2_grpc.MLModelServiceStub(channel)
+    def __init__(
+        self,
+        server_address: str,
+        size: int = POOL_SIZE,
+        credentials: Optional[grpc.ChannelCredentials] = None
+    ):
+        """
+        Open the channels.
         
-        # Test health check
-        print("\n1. Testing Health Check...")
-        try:
-            response = stub.HealthCheck(mlops_pb2.HealthRequest())
-            print(f"   Status: {response.status}")
-            print(f"   Version: {response.version}")
-        except Exception as e:
-            print(f"   Error: {e}")
+        Args:
+            server_address: Address of the gRPC server
+            size: Number of channels
+            credentials: Channel credentials, or None for insecure channels
+        """
+        # A distinct channel arg per channel keeps gRPC from sharing one
+        # subchannel, so each channel gets its own connection
+        self.channels = []
+        for i in range(size):
+            options = CHANNEL_OPTIONS + [("mlops.channel_id", i)]
+            if credentials is None:
+                channel = grpc.aio.insecure_channel(server_address, options=options)
+            else:
+                channel = grpc.aio.secure_channel(server_address, credentials, options=options)
+            self.channels.append(channel)
+        self._stubs = [mlops_pb2_grpc.MLModelServiceStub(channel) for channel in self.channels]
+        self._next = itertools.cycle(range(size))
+    
+    def stub(self) -> mlops_pb2_grpc.MLModelServiceStub:
+        """Get the stub of the next channel in turn."""
+        return self._stubs[next(self._next)]
+    
+    def channel(self) -> grpc.aio.Channel:
+        """Get the next channel in turn."""
+        return self.channels[next(self._next)]
+    
+    async def channel_ready(self) -> None:
+        """Wait until every channel is connected."""
+        await asyncio.gather(*(channel.channel_ready() for channel in self.channels))
+    
+    async def close(self) -> None:
+        """Close all channels."""
+        await asyncio.gather(*(channel.close() for channel in self.channels))
+    
+    async def __aenter__(self) -> "ChannelPool":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+class LatencyStats:
+    """Per-call latencies, grouped by label."""
+    
+    def __init__(self):
+        """Start with no recorded calls."""
+        self.latencies: Dict[str, List[int]] = {}
+    
+    async def timed(self, label: str, call: Awaitable):
+        """
+        Await a call and record how long it took, also when it fails.
         
-        # Test get available models
-        print("\n2. Testing Get Available Models...")
+        Args:
+            label: Name to group the latency under
+            call: Call or coroutine to await
+            
+        Returns:
+            Result of the call
+        """
+        start = time.perf_counter_ns()
         try:
-            response = stub.GetAvailableModels(mlops_pb2.Empty())
-            print(f"   Available model classes: {list(response.model_classes)}")
-        except Exception as e:
-            print(f"   Error: {e}")
+            return await call
+        finally:
+            self.latencies.setdefault(label, []).append(time.perf_counter_ns() - start)
+    
+    def last_us(self, label: str) -> float:
+        """Latency of the last call recorded under label, in microseconds."""
+        return self.latencies[label][-1] / 1e3
+    
+    def summary(self) -> List[str]:
+        """
+        Describe the recorded latencies.
         
-        # Test list datasets
-        print("\n3. Testing List Datasets...")
-        try:
-            response = stub.ListDatasets(mlops_pb2.Empty())
-            print(f"   Found {len(response.datasets)} datasets:")
-            for dataset in response.datasets:
-                print(f"     - {dataset.name} ({dataset.size} bytes)")
-        except Exception as e:
-            print(f"   Error: {e}")
+        Returns:
+            One line per label with the call count, mean and maximum
+        """
+        return [
+            f"{label}: {len(values)} calls, mean {sum(values) / len(values) / 1e3:.1f} us, "
+            f"max {max(values) / 1e3:.1f} us"
+            for label, values in self.latencies.items()
+        ]
+
+
+def add_feature_vectors(request: mlops_pb2.PredictRequest, features) -> None:
+    """
+    Append feature vectors to a Predict request.
+    
+    The matrix is converted to float64 (the proto's double) in one numpy
+    pass, and each row goes into its repeated field with a single extend
+    instead of one append per value.
+    
+    Args:
+        request: Request to fill
+        features: Feature matrix (nested lists or a 2D array)
+    """
+    for row in np.asarray(features, dtype=np.float64).tolist():
+        request.features.add().values.extend(row)
+
+
+def describe_error(error: grpc.RpcError) -> str:
+    """
+    Describe a failed call by its status code.
+    
+    Uses the code and details instead of str(error), which renders the
+    full debug string.
+    
+    Args:
+        error: Error raised by the call
         
-        # Test list models
-        print("\n4. Testing List Models...")
-        try:
-            response = stub.ListModels(mlops_pb2.Empty())
-            print(f"   Found {len(response.models)} models:")
-            for model in response.models:
-                print(f"     - {model.model_id} (trained: {model.is_trained})")
-        except Exception as e:
-            print(f"   Error: {e}")
+    Returns:
+        Short error description
+    """
+    code = error.code()
+    if code == grpc.StatusCode.UNAVAILABLE:
+        return "Server unavailable"
+    if code == grpc.StatusCode.DEADLINE_EXCEEDED:
+        return "Timed out"
+    return f"{code.name}: {error.details()}"
+
+
+def predict_requests(model_id: str, batches):
+    """
+    Build a Predict request per feature batch, lazily for streaming.
+    
+    Args:
+        model_id: ID of the model to predict with
+        batches: Iterable of feature matrices
+        
+    Yields:
+        Predict requests
+    """
+    # Set model_id once and copy it into each request instead of re-encoding it
+    template = mlops_pb2.PredictRequest(model_id=model_id)
+    for features in batches:
+        request = mlops_pb2.PredictRequest()
+        request.CopyFrom(template)
+        add_feature_vectors(request, features)
+        yield request
+
+
+async def call_with_retries(
+    pool: ChannelPool,
+    method: str,
+    request,
+    response_type,
+    **kwargs
+):
+    """
+    Make a unary call, retrying while the server is unavailable.
+    
+    The request is serialized once and the same bytes are resent on each
+    attempt, so retries do not re-encode the message.
+    
+    Args:
+        pool: Channel pool to call through
+        method: Full method name, e.g. '/mlops.MLModelService/Predict'
+        request: Request message
+        response_type: Response message class
+        **kwargs: Call options such as timeout or compression
         
-        # Test train model (if dataset exists)
-        print("\n5. Testing Train Model...")
+    Returns:
+        Response message
+    """
+    data = request.SerializeToString()
+    delay = RETRY_BACKOFF
+    for attempt in range(1, RETRY_ATTEMPTS + 1):
+        # No request serializer: the bytes are sent as they are
+        call = pool.channel().unary_unary(
+            method,
+            response_deserializer=response_type.FromString
+        )
         try:
-            # Example hyperparameters for Random Forest
-            hyperparameters = {
-                "n_estimators": 10,
-                "max_depth": 5,
-                "task_type": "classification"
-            }
+            return await call(data, **kwargs)
+        except grpc.RpcError as e:
+            if e.code() != grpc.StatusCode.UNAVAILABLE or attempt == RETRY_ATTEMPTS:
+                raise
+        await asyncio.sleep(delay)
+        delay *= 2
+
+
+async def test_grpc_service(server_address: str = "localhost:50051", use_tls: bool = False):
+    """
+    Test the gRPC service.
+    
+    Args:
+        server_address: Address of the gRPC server
+        use_tls: Connect to a remote server over TLS
+    """
+    # Output is collected and written once so terminal writes do not land
+    # between the timed calls
+    output: List[str] = []
+    emit = output.append
+    
+    try:
+        emit(f"Connecting to gRPC server at {server_address}...")
+        
+        stats = LatencyStats()
+        credentials = channel_credentials(server_address, use_tls)
+        async with ChannelPool(server_address, credentials=credentials) as pool:
+            # Connect once up front so the first call does not pay for the handshake
+            try:
+                await asyncio.wait_for(pool.channel_ready(), timeout=CONNECT_TIMEOUT)
+            except asyncio.TimeoutError:
+                emit(f"   Could not connect within {CONNECT_TIMEOUT}s")
             
-            request = mlops_pb2.TrainRequest(
-                model_class="random_forest",
-                hyperparameters_json=json.dumps(hyperparameters),
-                dataset_name="test_dataset.csv"  # Change to actual dataset name
+            # The probes are independent: run them all at once so they spread over
+            # the pool and take one round trip instead of one each
+            responses = await asyncio.gather(
+                *(
+                    stats.timed(method, getattr(pool.stub(), method)(request, timeout=RPC_TIMEOUT))
+                    for _, method, request, _ in PROBES
+                ),
+                return_exceptions=True
             )
             
-            response = stub.TrainModel(request)
-            if response.model_id:
-                print(f"   Model trained successfully!")
-                print(f"   Model ID: {response.model_id}")
-                print(f"   Metrics: {response.metrics_json}")
-            else:
-                print("   Training failed (check server logs)")
-        except Exception as e:
-            print(f"   Error: {e}")
-        
-        # Test predict (if model exists)
-        print("\n6. Testing Predict...")
-        try:
-            # Example features
-            features = [
-                mlops_pb2.FeatureVector(values=[1.0, 2.0, 3.0, 4.0])
-            ]
+            for number, ((label, method, _, format_response), response) in enumerate(zip(PROBES, responses), 1):
+                emit(f"\n{number}. Testing {label}... ({stats.last_us(method):.1f} us)")
+                if isinstance(response, grpc.RpcError):
+                    emit(f"   Error: {describe_error(response)}")
+                elif isinstance(response, BaseException):
+                    raise response
+                else:
+                    for line in format_response(response):
+                        emit(f"   {line}")
             
-            request = mlops_pb2.PredictRequest(
-                model_id="test_model_id",  # Change to actual model ID
-                features=features
-            )
+            # Test train model (if dataset exists)
+            emit(f"\n{len(PROBES) + 1}. Testing Train Model...")
+            try:
+                request = mlops_pb2.TrainRequest(
+                    model_class=MODEL_CLASS,
+                    hyperparameters_json=HYPERPARAMETERS_JSON,
+                    dataset_name=DATASET_NAME
+                )
+                
+                response = await stats.timed("TrainModel", call_with_retries(
+                    pool,
+                    "/mlops.MLModelService/TrainModel",
+                    request,
+                    mlops_pb2.TrainResponse,
+                    compression=REQUEST_COMPRESSION
+                ))
+                emit(f"   Latency: {stats.last_us('TrainModel'):.1f} us")
+                if response.model_id:
+                    emit(f"   Model trained successfully!")
+                    emit(f"   Model ID: {response.model_id}")
+                    emit(f"   Metrics: {response.metrics_json}")
+                else:
+                    emit("   Training failed (check server logs)")
+            except grpc.RpcError as e:
+                emit(f"   Error: {describe_error(e)}")
             
-            response = stub.Predict(request)
-            print(f"   Predictions: {list(response.predictions)}")
-        except Exception as e:
-            print(f"   Error: {e}")
-        
-        print("\n=== gRPC Client Test Complete ===")
+            # Test predict (if model exists)
+            emit(f"\n{len(PROBES) + 2}. Testing Predict...")
+            try:
+                # Example features
+                features = [[1.0, 2.0, 3.0, 4.0]]
+                
+                request = mlops_pb2.PredictRequest(
+                    model_id=MODEL_ID
+                )
+                add_feature_vectors(request, features)
+                
+                response = await stats.timed("Predict", call_with_retries(
+                    pool,
+                    "/mlops.MLModelService/Predict",
+                    request,
+                    mlops_pb2.PredictResponse,
+                    compression=REQUEST_COMPRESSION
+                ))
+                emit(f"   Latency: {stats.last_us('Predict'):.1f} us")
+                shown = list(itertools.islice(response.predictions, PREDICTIONS_SHOWN))
+                emit(f"   Predictions ({len(shown)} of {len(response.predictions)}): {shown}")
+            except grpc.RpcError as e:
+                emit(f"   Error: {describe_error(e)}")
+            
+            # Test streaming predict: many batches share one stream instead of one call each
+            emit(f"\n{len(PROBES) + 3}. Testing Predict Stream...")
+            try:
+                batches = [[[1.0, 2.0, 3.0, 4.0]] for _ in range(STREAM_BATCHES)]
+                
+                async def predict_stream() -> int:
+                    call = pool.stub().PredictStream(
+                        predict_requests(MODEL_ID, batches),
+                        compression=REQUEST_COMPRESSION
+                    )
+                    count = 0
+                    async for response in call:
+                        count += len(response.predictions)
+                    return count
+                
+                predictions = await stats.timed("PredictStream", predict_stream())
+                emit(f"   Latency: {stats.last_us('PredictStream'):.1f} us")
+                emit(f"   Received {predictions} predictions for {len(batches)} streamed requests")
+            except grpc.RpcError as e:
+                emit(f"   Error: {describe_error(e)}")
+            
+            emit("\nLatencies:")
+            for line in stats.summary():
+                emit(f"   {line}")
+            
+            emit("\n=== gRPC Client Test Complete ===")
+    finally:
+        sys.stdout.write("\n".join(output) + "\n")
+        sys.stdout.flush()
 
 
 if __name__ == "__main__":
-    import sys
-    server_address = sys.argv[1] if len(sys.argv) > 1 else "localhost:50051"
-    test_grpc_service(server_address)
+    args = [arg for arg in sys.argv[1:] if arg != "--tls"]
+    server_address = args[0] if args else "localhost:50051"
+    asyncio.run(test_grpc_service(server_address, use_tls="--tls" in sys.argv[1:]))
 
 
 
@@ -0,0 +1,5 @@
+"""Generated protobuf and gRPC code for the MLOps service.
+
+Kept outside the app package so clients can import it without loading the
+server, its services and their ML dependencies.
+"""
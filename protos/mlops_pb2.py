@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: protos/mlops.proto
+# Protobuf Python Version: 6.31.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    6,
+    31,
+    1,
+    '',
+    'protos/mlops.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x12protos/mlops.proto\x12\x05mlops\"\x07\n\x05\x45mpty\"\x0f\n\rHealthRequest\"1\n\x0eHealthResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t\"0\n\x17\x41vailableModelsResponse\x12\x15\n\rmodel_classes\x18\x01 \x03(\t\"W\n\x0cTrainRequest\x12\x13\n\x0bmodel_class\x18\x01 \x01(\t\x12\x1c\n\x14hyperparameters_json\x18\x02 \x01(\t\x12\x14\n\x0c\x64\x61taset_name\x18\x03 \x01(\t\"H\n\rTrainResponse\x12\x10\n\x08model_id\x18\x01 \x01(\t\x12\x14\n\x0cmetrics_json\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\"J\n\x0ePredictRequest\x12\x10\n\x08model_id\x18\x01 \x01(\t\x12&\n\x08\x66\x65\x61tures\x18\x02 \x03(\x0b\x32\x14.mlops.FeatureVector\"\x1f\n\rFeatureVector\x12\x0e\n\x06values\x18\x01 \x03(\x01\"&\n\x0fPredictResponse\x12\x13\n\x0bpredictions\x18\x01 \x03(\t\"V\n\x0eRetrainRequest\x12\x10\n\x08model_id\x18\x01 \x01(\t\x12\x14\n\x0c\x64\x61taset_name\x18\x02 \x01(\t\x12\x1c\n\x14hyperparameters_json\x18\x03 \x01(\t\"&\n\x12\x44\x65leteModelRequest\x12\x10\n\x08model_id\x18\x01 \x01(\t\"&\n\x13\x44\x65leteModelResponse\x12\x0f\n\x07message\x18\x01 \x01(\t\"O\n\tModelInfo\x12\x10\n\x08model_id\x18\x01 \x01(\t\x12\x12\n\nis_trained\x18\x02 \x01(\x08\x12\x1c\n\x14hyperparameters_json\x18\x03 \x01(\t\"6\n\x12ModelsListResponse\x12 \n\x06models\x18\x01 \x03(\x0b\x32\x10.mlops.ModelInfo\"7\n\x0b\x44\x61tasetInfo\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04path\x18\x02 \x01(\t\x12\x0c\n\x04size\x18\x03 \x01(\x03\"<\n\x14\x44\x61tasetsListResponse\x12$\n\x08\x64\x61tasets\x18\x01 \x03(\x0b\x32\x12.mlops.DatasetInfo2\xbc\x04\n\x0eMLModelService\x12:\n\x0bHealthCheck\x12\x14.mlops.HealthRequest\x1a\x15.mlops.HealthResponse\x12\x42\n\x12GetAvailableModels\x12\x0c.mlops.Empty\x1a\x1e.mlops.AvailableModelsResponse\x12\x35\n\nListModels\x12\x0c.mlops.Empty\x1a\x19.mlops.ModelsListResponse\x12\x37\n\nTrainModel\x12\x13.mlops.TrainRequest\x1a\x14.mlops.TrainResponse\x12\x38\n\x07Predict\x12\x15.mlops.PredictRequest\x1a\x16.mlops.PredictResponse\x12\x42\n\rPredictStream\x12\x15.mlops.PredictRequest\x1a\x16.mlops.PredictResponse(\x01\x30\x01\x12;\n\x0cRetrainModel\x12\x15.mlops.RetrainRequest\x1a\x14.mlops.TrainResponse\x12\x44\n\x0b\x44\x65leteModel\x12\x19.mlops.DeleteModelRequest\x1a\x1a.mlops.DeleteModelResponse\x12\x39\n\x0cListDatasets\x12\x0c.mlops.Empty\x1a\x1b.mlops.DatasetsListResponseb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'protos.mlops_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_EMPTY']._serialized_start=29
+  _globals['_EMPTY']._serialized_end=36
+  _globals['_HEALTHREQUEST']._serialized_start=38
+  _globals['_HEALTHREQUEST']._serialized_end=53
+  _globals['_HEALTHRESPONSE']._serialized_start=55
+  _globals['_HEALTHRESPONSE']._serialized_end=104
+  _globals['_AVAILABLEMODELSRESPONSE']._serialized_start=106
+  _globals['_AVAILABLEMODELSRESPONSE']._serialized_end=154
+  _globals['_TRAINREQUEST']._serialized_start=156
+  _globals['_TRAINREQUEST']._serialized_end=243
+  _globals['_TRAINRESPONSE']._serialized_start=245
+  _globals['_TRAINRESPONSE']._serialized_end=317
+  _globals['_PREDICTREQUEST']._serialized_start=319
+  _globals['_PREDICTREQUEST']._serialized_end=393
+  _globals['_FEATUREVECTOR']._serialized_start=395
+  _globals['_FEATUREVECTOR']._serialized_end=426
+  _globals['_PREDICTRESPONSE']._serialized_start=428
+  _globals['_PREDICTRESPONSE']._serialized_end=466
+  _globals['_RETRAINREQUEST']._serialized_start=468
+  _globals['_RETRAINREQUEST']._serialized_end=554
+  _globals['_DELETEMODELREQUEST']._serialized_start=556
+  _globals['_DELETEMODELREQUEST']._serialized_end=594
+  _globals['_DELETEMODELRESPONSE']._serialized_start=596
+  _globals['_DELETEMODELRESPONSE']._serialized_end=634
+  _globals['_MODELINFO']._serialized_start=636
+  _globals['_MODELINFO']._serialized_end=715
+  _globals['_MODELSLISTRESPONSE']._serialized_start=717
+  _globals['_MODELSLISTRESPONSE']._serialized_end=771
+  _globals['_DATASETINFO']._serialized_start=773
+  _globals['_DATASETINFO']._serialized_end=828
+  _globals['_DATASETSLISTRESPONSE']._serialized_start=830
+  _globals['_DATASETSLISTRESPONSE']._serialized_end=890
+  _globals['_MLMODELSERVICE']._serialized_start=893
+  _globals['_MLMODELSERVICE']._serialized_end=1465
+# @@protoc_insertion_point(module_scope)
@@ -3,7 +3,7 @@
 import grpc
 import warnings
 
-import mlops_pb2 as mlops__pb2
+from protos import mlops_pb2 as protos_dot_mlops__pb2
 
 GRPC_GENERATED_VERSION = '1.76.0'
 GRPC_VERSION = grpc.__version__
@@ -18,7 +18,7 @@ except ImportError:
 if _version_not_supported:
     raise RuntimeError(
         f'The grpc package installed is at version {GRPC_VERSION},'
-        + ' but the generated code in mlops_pb2_grpc.py depends on'
+        + ' but the generated code in protos/mlops_pb2_grpc.py depends on'
         + f' grpcio>={GRPC_GENERATED_VERSION}.'
         + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
         + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
@@ -37,43 +37,48 @@ class MLModelServiceStub(object):
         """
         self.HealthCheck = channel.unary_unary(
                 '/mlops.MLModelService/HealthCheck',
-                request_serializer=mlops__pb2.HealthRequest.SerializeToString,
-                response_deserializer=mlops__pb2.HealthResponse.FromString,
+                request_serializer=protos_dot_mlops__pb2.HealthRequest.SerializeToString,
+                response_deserializer=protos_dot_mlops__pb2.HealthResponse.FromString,
                 _registered_method=True)
         self.GetAvailableModels = channel.unary_unary(
                 '/mlops.MLModelService/GetAvailableModels',
-                request_serializer=mlops__pb2.Empty.SerializeToString,
-                response_deserializer=mlops__pb2.AvailableModelsResponse.FromString,
+                request_serializer=protos_dot_mlops__pb2.Empty.SerializeToString,
+                response_deserializer=protos_dot_mlops__pb2.AvailableModelsResponse.FromString,
                 _registered_method=True)
         self.ListModels = channel.unary_unary(
                 '/mlops.MLModelService/ListModels',
-                request_serializer=mlops__pb2.Empty.SerializeToString,
-                response_deserializer=mlops__pb2.ModelsListResponse.FromString,
+                request_serializer=protos_dot_mlops__pb2.Empty.SerializeToString,
+                response_deserializer=protos_dot_mlops__pb2.ModelsListResponse.FromString,
                 _registered_method=True)
         self.TrainModel = channel.unary_unary(
                 '/mlops.MLModelService/TrainModel',
-                request_serializer=mlops__pb2.TrainRequest.SerializeToString,
-                response_deserializer=mlops__pb2.TrainResponse.FromString,
+                request_serializer=protos_dot_mlops__pb2.TrainRequest.SerializeToString,
+                response_deserializer=protos_dot_mlops__pb2.TrainResponse.FromString,
                 _registered_method=True)
         self.Predict = channel.unary_unary(
                 '/mlops.MLModelService/Predict',
-                request_serializer=mlops__pb2.PredictRequest.SerializeToString,
-                response_deserializer=mlops__pb2.PredictResponse.FromString,
+                request_serializer=protos_dot_mlops__pb2.PredictRequest.SerializeToString,
+                response_deserializer=protos_dot_mlops__pb2.PredictResponse.FromString,
+                _registered_method=True)
+        self.PredictStream = channel.stream_stream(
+                '/mlops.MLModelService/PredictStream',
+                request_serializer=protos_dot_mlops__pb2.PredictRequest.SerializeToString,
+                response_deserializer=protos_dot_mlops__pb2.PredictResponse.FromString,
                 _registered_method=True)
         self.RetrainModel = channel.unary_unary(
                 '/mlops.MLModelService/RetrainModel',
-                request_serializer=mlops__pb2.RetrainRequest.SerializeToString,
-                response_deserializer=mlops__pb2.TrainResponse.FromString,
+                request_serializer=protos_dot_mlops__pb2.RetrainRequest.SerializeToString,
+                response_deserializer=protos_dot_mlops__pb2.TrainResponse.FromString,
                 _registered_method=True)
         self.DeleteModel = channel.unary_unary(
                 '/mlops.MLModelService/DeleteModel',
-                request_serializer=mlops__pb2.DeleteModelRequest.SerializeToString,
-                response_deserializer=mlops__pb2.DeleteModelResponse.FromString,
+                request_serializer=protos_dot_mlops__pb2.DeleteModelRequest.SerializeToString,
+                response_deserializer=protos_dot_mlops__pb2.DeleteModelResponse.FromString,
                 _registered_method=True)
         self.ListDatasets = channel.unary_unary(
                 '/mlops.MLModelService/ListDatasets',
-                request_serializer=mlops__pb2.Empty.SerializeToString,
-                response_deserializer=mlops__pb2.DatasetsListResponse.FromString,
+                request_serializer=protos_dot_mlops__pb2.Empty.SerializeToString,
+                response_deserializer=protos_dot_mlops__pb2.DatasetsListResponse.FromString,
                 _registered_method=True)
 
 
@@ -116,6 +121,13 @@ class MLModelServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def PredictStream(self, request_iterator, context):
+        """Get predictions for many requests over one stream, one response per request
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def RetrainModel(self, request, context):
         """Retrain an existing model
         """
@@ -142,43 +154,48 @@ def add_MLModelServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
             'HealthCheck': grpc.unary_unary_rpc_method_handler(
                     servicer.HealthCheck,
-                    request_deserializer=mlops__pb2.HealthRequest.FromString,
-                    response_serializer=mlops__pb2.HealthResponse.SerializeToString,
+                    request_deserializer=protos_dot_mlops__pb2.HealthRequest.FromString,
+                    response_serializer=protos_dot_mlops__pb2.HealthResponse.SerializeToString,
             ),
             'GetAvailableModels': grpc.unary_unary_rpc_method_handler(
                     servicer.GetAvailableModels,
-                    request_deserializer=mlops__pb2.Empty.FromString,
-                    response_serializer=mlops__pb2.AvailableModelsResponse.SerializeToString,
+                    request_deserializer=protos_dot_mlops__pb2.Empty.FromString,
+                    response_serializer=protos_dot_mlops__pb2.AvailableModelsResponse.SerializeToString,
             ),
             'ListModels': grpc.unary_unary_rpc_method_handler(
                     servicer.ListModels,
-                    request_deserializer=mlops__pb2.Empty.FromString,
-                    response_serializer=mlops__pb2.ModelsListResponse.SerializeToString,
+                    request_deserializer=protos_dot_mlops__pb2.Empty.FromString,
+                    response_serializer=protos_dot_mlops__pb2.ModelsListResponse.SerializeToString,
             ),
             'TrainModel': grpc.unary_unary_rpc_method_handler(
                     servicer.TrainModel,
-                    request_deserializer=mlops__pb2.TrainRequest.FromString,
-                    response_serializer=mlops__pb2.TrainResponse.SerializeToString,
+                    request_deserializer=protos_dot_mlops__pb2.TrainRequest.FromString,
+                    response_serializer=protos_dot_mlops__pb2.TrainResponse.SerializeToString,
             ),
             'Predict': grpc.unary_unary_rpc_method_handler(
                     servicer.Predict,
-                    request_deserializer=mlops__pb2.PredictRequest.FromString,
-                    response_serializer=mlops__pb2.PredictResponse.SerializeToString,
+                    request_deserializer=protos_dot_mlops__pb2.PredictRequest.FromString,
+                    response_serializer=protos_dot_mlops__pb2.PredictResponse.SerializeToString,
+            ),
+            'PredictStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.PredictStream,
+                    request_deserializer=protos_dot_mlops__pb2.PredictRequest.FromString,
+                    response_serializer=protos_dot_mlops__pb2.PredictResponse.SerializeToString,
             ),
             'RetrainModel': grpc.unary_unary_rpc_method_handler(
                     servicer.RetrainModel,
-                    request_deserializer=mlops__pb2.RetrainRequest.FromString,
-                    response_serializer=mlops__pb2.TrainResponse.SerializeToString,
+                    request_deserializer=protos_dot_mlops__pb2.RetrainRequest.FromString,
+                    response_serializer=protos_dot_mlops__pb2.TrainResponse.SerializeToString,
             ),
             'DeleteModel': grpc.unary_unary_rpc_method_handler(
                     servicer.DeleteModel,
-                    request_deserializer=mlops__pb2.DeleteModelRequest.FromString,
-                    response_serializer=mlops__pb2.DeleteModelResponse.SerializeToString,
+                    request_deserializer=protos_dot_mlops__pb2.DeleteModelRequest.FromString,
+                    response_serializer=protos_dot_mlops__pb2.DeleteModelResponse.SerializeToString,
             ),
             'ListDatasets': grpc.unary_unary_rpc_method_handler(
                     servicer.ListDatasets,
-                    request_deserializer=mlops__pb2.Empty.FromString,
-                    response_serializer=mlops__pb2.DatasetsListResponse.SerializeToString,
+                    request_deserializer=protos_dot_mlops__pb2.Empty.FromString,
+                    response_serializer=protos_dot_mlops__pb2.DatasetsListResponse.SerializeToString,
             ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
@@ -207,8 +224,8 @@ class MLModelService(object):
             request,
             target,
             '/mlops.MLModelService/HealthCheck',
-            mlops__pb2.HealthRequest.SerializeToString,
-            mlops__pb2.HealthResponse.FromString,
+            protos_dot_mlops__pb2.HealthRequest.SerializeToString,
+            protos_dot_mlops__pb2.HealthResponse.FromString,
             options,
             channel_credentials,
             insecure,
@@ -234,8 +251,8 @@ class MLModelService(object):
             request,
             target,
             '/mlops.MLModelService/GetAvailableModels',
-            mlops__pb2.Empty.SerializeToString,
-            mlops__pb2.AvailableModelsResponse.FromString,
+            protos_dot_mlops__pb2.Empty.SerializeToString,
+            protos_dot_mlops__pb2.AvailableModelsResponse.FromString,
             options,
             channel_credentials,
             insecure,
@@ -261,8 +278,8 @@ class MLModelService(object):
             request,
             target,
             '/mlops.MLModelService/ListModels',
-            mlops__pb2.Empty.SerializeToString,
-            mlops__pb2.ModelsListResponse.FromString,
+            protos_dot_mlops__pb2.Empty.SerializeToString,
+            protos_dot_mlops__pb2.ModelsListResponse.FromString,
             options,
             channel_credentials,
             insecure,
@@ -288,8 +305,8 @@ class MLModelService(object):
             request,
             target,
             '/mlops.MLModelService/TrainModel',
-            mlops__pb2.TrainRequest.SerializeToString,
-            mlops__pb2.TrainResponse.FromString,
+            protos_dot_mlops__pb2.TrainRequest.SerializeToString,
+            protos_dot_mlops__pb2.TrainResponse.FromString,
             options,
             channel_credentials,
             insecure,
@@ -315,8 +332,35 @@ class MLModelService(object):
             request,
             target,
             '/mlops.MLModelService/Predict',
-            mlops__pb2.PredictRequest.SerializeToString,
-            mlops__pb2.PredictResponse.FromString,
+            protos_dot_mlops__pb2.PredictRequest.SerializeToString,
+            protos_dot_mlops__pb2.PredictResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def PredictStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/mlops.MLModelService/PredictStream',
+            protos_dot_mlops__pb2.PredictRequest.SerializeToString,
+            protos_dot_mlops__pb2.PredictResponse.FromString,
             options,
             channel_credentials,
             insecure,
@@ -342,8 +386,8 @@ class MLModelService(object):
             request,
             target,
             '/mlops.MLModelService/RetrainModel',
-            mlops__pb2.RetrainRequest.SerializeToString,
-            mlops__pb2.TrainResponse.FromString,
+            protos_dot_mlops__pb2.RetrainRequest.SerializeToString,
+            protos_dot_mlops__pb2.TrainResponse.FromString,
             options,
             channel_credentials,
             insecure,
@@ -369,8 +413,8 @@ class MLModelService(object):
             request,
             target,
             '/mlops.MLModelService/DeleteModel',
-            mlops__pb2.DeleteModelRequest.SerializeToString,
-            mlops__pb2.DeleteModelResponse.FromString,
+            protos_dot_mlops__pb2.DeleteModelRequest.SerializeToString,
+            protos_dot_mlops__pb2.DeleteModelResponse.FromString,
             options,
             channel_credentials,
             insecure,
@@ -396,8 +440,8 @@ class MLModelService(object):
             request,
             target,
             '/mlops.MLModelService/ListDatasets',
-            mlops__pb2.Empty.SerializeToString,
-            mlops__pb2.DatasetsListResponse.FromString,
+            protos_dot_mlops__pb2.Empty.SerializeToString,
+            protos_dot_mlops__pb2.DatasetsListResponse.FromString,
             options,
             channel_credentials,
             insecure,
@@ -407,4 +451,3 @@ class MLModelService(object):
             timeout,
             metadata,
             _registered_method=True)
-